@@ -0,0 +1,115 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskSignals(QObject):
+    """Arka plan görevinin sonuçlarını ana (GUI) thread'e taşıyan sinyaller."""
+    finished = pyqtSignal(object) # Görevin dönüş değeri
+    failed = pyqtSignal(object) # Görevde oluşan hata (Exception)
+    progress = pyqtSignal(object) # progress_callback'e verilen değerler (tuple)
+
+
+class BackgroundTask(QRunnable):
+    """
+    Bir fonksiyonu QThreadPool thread'inde çalıştırır. Sonuç ve hatalar sinyallerle bildirilir;
+    widget'lara asla bu thread'den dokunulmaz.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+        self.thread_id = None # Görev çalışırken çalıştığı thread'in kimliği (sorgu iptali için)
+        self._thread_lock = threading.Lock()
+        self.setAutoDelete(False)
+
+    def report_progress(self, *values):
+        """progress_callback olarak kullanılır: ilerlemeyi ana thread'e iletir, iptal edildiyse False döndürür."""
+        self.signals.progress.emit(values)
+        return not self.cancelled
+
+    def cancel_running_queries(self, db_manager):
+        """Görev hâlâ çalışıyorsa thread'inin sorgularını iptal eder (thread başka bir göreve geçmişse dokunmaz)."""
+        with self._thread_lock:
+            if self.thread_id is not None:
+                db_manager.cancel_queries(self.thread_id)
+
+    def run(self):
+        with self._thread_lock:
+            self.thread_id = threading.get_ident()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            with self._thread_lock:
+                self.thread_id = None
+
+
+class TaskRunner(QObject):
+    """
+    Veritabanı sorgularını ve rapor verisi hazırlığını GUI thread'i dışında çalıştırır.
+    Sonuç callback'leri ana thread'de çağrılır; cancel_all() çalışan sorguları sunucu tarafında iptal eder.
+    """
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, db_manager, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.thread_pool = QThreadPool(self)
+        # Aynı anda havuzdaki bağlantı sayısından fazla görev çalıştırmanın faydası yok
+        self.thread_pool.setMaxThreadCount(max(1, min(max_threads, getattr(db_manager, 'maxconn', max_threads))))
+        self._active_tasks = []
+
+    def run(self, fn, *args, on_success=None, on_error=None, on_progress=None, on_cancelled=None, with_progress=False, **kwargs):
+        """
+        fn(*args, **kwargs) çağrısını arka planda çalıştırır ve görevi döndürür.
+        with_progress=True ise fn'e progress_callback olarak task.report_progress verilir.
+        İptal edilen görevin sonucu/hatası yok sayılır ve yalnızca on_cancelled çağrılır.
+        """
+        task = BackgroundTask(fn, *args, **kwargs)
+        if with_progress:
+            task.kwargs['progress_callback'] = task.report_progress
+
+        task.signals.finished.connect(lambda result: self._on_task_done(task, on_success, result, on_cancelled))
+        task.signals.failed.connect(lambda error: self._on_task_done(task, on_error, error, on_cancelled))
+        if on_progress:
+            task.signals.progress.connect(lambda values: on_progress(*values))
+
+        self._active_tasks.append(task)
+        if len(self._active_tasks) == 1:
+            self.busy_changed.emit(True)
+        self.thread_pool.start(task)
+        return task
+
+    def _on_task_done(self, task, callback, value, on_cancelled):
+        # Ana thread'de çalışır (sinyaller kuyruklu bağlantı ile gelir)
+        if task in self._active_tasks:
+            self._active_tasks.remove(task)
+            if not self._active_tasks:
+                self.busy_changed.emit(False)
+        if task.cancelled:
+            if on_cancelled:
+                on_cancelled()
+        elif callback:
+            callback(value)
+
+    def cancel(self, task):
+        """Görevi iptal edildi olarak işaretler ve çalışan sorgusunu (varsa) iptal eder."""
+        task.cancelled = True
+        task.cancel_running_queries(self.db)
+
+    def cancel_all(self):
+        for task in list(self._active_tasks):
+            self.cancel(task)
+
+    def is_busy(self):
+        return bool(self._active_tasks)
+
+    def wait_for_done(self, timeout_ms=-1):
+        """Uygulama kapanırken çalışan görevlerin bitmesini bekler."""
+        return self.thread_pool.waitForDone(timeout_ms)
@@ -0,0 +1,488 @@
+"""
+Performans ölçümleri (komut satırı).
+
+Gerçekçi, sentetik liman verisi (ISO 6346'ya göre geçerli konteyner numaralarıyla) üretir; DBManager ve
+ReportGenerator'ın temel yollarını (arama, tümünü getirme, içe/dışa aktarma, tüm raporlar ve faturalandırma)
+zamanlar ve sonuçları çalıştırmalar arasında karşılaştırılabilecek bir JSON dosyasına yazar.
+
+Veritabanı ölçümleri tabloları BOŞALTIR; yalnızca atılabilir bir deneme veritabanında çalıştırın. Bağlantı bilgileri
+konfigürasyondan (app.ini / ortam değişkenleri) alınır, veritabanı adı --dbname ile açıkça verilmelidir.
+
+Kullanım:
+    python benchmark.py --scale 10k --dbname port_bench                  # veritabanı + pandas ölçümleri
+    python benchmark.py --scale 1m --no-db                               # yalnızca pandas yolları (veritabanı gerekmez)
+    python benchmark.py --rows 250000 --dbname port_bench --skip get_all_port_operations
+    python benchmark.py --scale 10k --no-db --compare benchmark_eski.json
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from db_operations import (
+    DBManager, PortOperationsSnapshot, PORT_OPERATIONS_COLUMNS, LOG_TABLES, read_csv_in_chunks, prepare_port_operations_frame
+)
+from reports import ReportGenerator, REPORT_TYPES, render_report_batch
+from gui_pyqt import calculate_iso6346_check_digit
+
+
+# Hazır ölçekler (port_operations satır sayısı)
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+# Veri üretimi ve CSV yazımı bu boyutta parçalarla yapılır; 10M satırda da bellekte yalnızca bir parça tutulur
+GENERATE_CHUNK_SIZE = 100_000
+# port_operations satırı başına log satırı oranları
+CONTAINER_LOGS_PER_OPERATION = 2
+USER_ACTIONS_PER_OPERATION = 0.5
+# Toplu yazma API'leri ile tek satırlık döngünün karşılaştırıldığı satır sayısı (döngü yavaş olduğu için ölçekten bağımsız)
+BULK_WRITE_ROWS = 5000
+
+VESSEL_NAME_PARTS = (
+    ['MSC', 'MAERSK', 'CMA CGM', 'COSCO', 'EVER', 'HAPAG', 'ONE', 'YANG MING', 'ARKAS', 'ZIM'],
+    ['ISTANBUL', 'AEGEAN', 'ANATOLIA', 'MARMARA', 'OCEAN', 'HARMONY', 'GLORY', 'PIONEER', 'STAR', 'VOYAGER',
+     'ATLAS', 'BOSPHORUS', 'EXPRESS', 'HORIZON', 'TRITON']
+)
+PORTS = ['Istanbul', 'Mersin', 'Izmir', 'Ambarli', 'Gemlik', 'Hamburg', 'Rotterdam', 'Antwerp', 'Piraeus',
+         'Valencia', 'Genoa', 'Shanghai', 'Singapore', 'Jebel Ali', 'Port Said', 'Constanta', 'Novorossiysk']
+CONTAINER_SIZES = [20, 40, 45]
+CONTAINER_TYPES = ['Dry', 'Reefer', 'Open Top', 'Flat Rack', 'Tank', 'High Cube']
+OPERATION_TYPES = ['Load', 'Discharge', 'Gate In', 'Gate Out', 'Transshipment', 'Shifting']
+TERMINALS = ['Terminal A', 'Terminal B', 'Terminal C', 'Terminal D']
+TRANSPORT_MODES = ['Vessel', 'Truck', 'Rail', 'Barge']
+CONTAINER_STATUSES = ['Full', 'Empty', 'In Transit', 'Delivered', 'On Hold']
+LOCATION_AREAS = [f"{block}{row:02d}" for block in 'ABCDEFGH' for row in range(1, 13)]
+HANDLING_EQUIPMENT = ['STS Crane', 'RTG', 'Reach Stacker', 'Straddle Carrier', 'Forklift']
+CUSTOMS_STATUSES = ['Cleared', 'Pending', 'Inspection', 'Hold']
+USERNAMES = ['admin'] + [f"operator{i}" for i in range(1, 20)]
+USER_ACTION_TYPES = ['Login', 'Search Container', 'Filter Data', 'Import Data', 'Export Data', 'Update Container',
+                     'Generate Report', 'Generate Billing Report', 'Update Tariff']
+
+
+def _owner_codes(count, seed=0):
+    """ISO 6346 sahip kodları (3 harf + 'U'). Aynı seed ile daha uzun liste her zaman daha kısa olanla aynı başlar."""
+    rng = np.random.default_rng(seed)
+    owners = []
+    while len(owners) < count:
+        owner = ''.join(rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 3)) + 'U'
+        if owner not in owners:
+            owners.append(owner)
+    return owners
+
+
+def generate_container_ids(indices, seed=0):
+    """
+    Verilen sıra numaraları için ISO 6346'ya göre geçerli konteyner numaraları üretir (örn. 'MSKU1234565').
+    Aynı sıra numarası her zaman aynı numarayı verir; her sahip kodu 1.000.000 seri numarası taşır.
+    """
+    indices = np.asarray(indices)
+    owners = _owner_codes(int(indices.max()) // 1_000_000 + 1 if len(indices) else 0, seed)
+    ids = []
+    for index in indices.tolist():
+        base = f"{owners[index // 1_000_000]}{index % 1_000_000:06d}"
+        ids.append(f"{base}{calculate_iso6346_check_digit(base)}")
+    return ids
+
+
+def vessel_names_for(rows):
+    """Satır sayısıyla orantılı (en az 20) gerçekçi gemi adı listesi döndürür."""
+    count = max(20, min(rows // 5000, len(VESSEL_NAME_PARTS[0]) * len(VESSEL_NAME_PARTS[1]) * 10))
+    names = []
+    for index in range(count):
+        carrier = VESSEL_NAME_PARTS[0][index % len(VESSEL_NAME_PARTS[0])]
+        name = VESSEL_NAME_PARTS[1][(index // len(VESSEL_NAME_PARTS[0])) % len(VESSEL_NAME_PARTS[1])]
+        suffix = index // (len(VESSEL_NAME_PARTS[0]) * len(VESSEL_NAME_PARTS[1]))
+        names.append(f"{carrier} {name}" + (f" {suffix + 1}" if suffix else ""))
+    return names
+
+
+def _random_times(rng, count, start, days):
+    """start'tan itibaren days gün içinde rastgele, dakika hassasiyetinde UTC zaman damgaları üretir."""
+    minutes = rng.integers(0, days * 24 * 60, count)
+    return pd.to_datetime(start) + pd.to_timedelta(minutes, unit='m')
+
+
+def generate_port_operations(rows, seed=0, chunk_size=GENERATE_CHUNK_SIZE, start=datetime(2022, 1, 1, tzinfo=timezone.utc), days=3 * 365):
+    """
+    port_operations tablosu sütunlarıyla (tablo tiplerine uygun) chunk_size satırlık sentetik DataFrame parçaları üretir.
+    Aynı seed aynı veriyi üretir. Çıkış tarihi olmayan (hâlâ limanda bekleyen) konteynerler de bulunur.
+    """
+    vessels = vessel_names_for(rows)
+    vessel_imos = {name: 9_000_000 + index * 37 for index, name in enumerate(vessels)}
+
+    for chunk_index, chunk_start in enumerate(range(0, rows, chunk_size)):
+        count = min(chunk_size, rows - chunk_start)
+        rng = np.random.default_rng([seed, chunk_index])
+        vessel = rng.choice(vessels, count)
+        timestamps = _random_times(rng, count, start, days)
+        arrival = timestamps - pd.to_timedelta(rng.integers(0, 3 * 24 * 60, count), unit='m')
+        departure = pd.Series(arrival + pd.to_timedelta(rng.integers(60, 30 * 24 * 60, count), unit='m'))
+        departure[rng.random(count) < 0.1] = pd.NaT # Henüz çıkmamış konteynerler
+
+        yield pd.DataFrame({
+            'vessel_name': vessel,
+            'imo_number': pd.array([vessel_imos[name] for name in vessel], dtype='Int64'),
+            'arrival_port': rng.choice(PORTS, count),
+            'departure_port': rng.choice(PORTS, count),
+            'container_id': generate_container_ids(np.arange(chunk_start, chunk_start + count), seed),
+            'container_size': pd.array(rng.choice(CONTAINER_SIZES, count), dtype='Int64'),
+            'container_type': rng.choice(CONTAINER_TYPES, count),
+            'operation_type': rng.choice(OPERATION_TYPES, count),
+            'timestamp': timestamps,
+            'terminal_name': rng.choice(TERMINALS, count),
+            'transport_mode': rng.choice(TRANSPORT_MODES, count),
+            'container_status': rng.choice(CONTAINER_STATUSES, count, p=[0.45, 0.25, 0.15, 0.1, 0.05]),
+            'location_area': rng.choice(LOCATION_AREAS, count),
+            'handling_equipment': rng.choice(HANDLING_EQUIPMENT, count),
+            'customs_clearance_status': rng.choice(CUSTOMS_STATUSES, count, p=[0.7, 0.15, 0.1, 0.05]),
+            'weight_kg': pd.array(rng.integers(2_000, 32_000, count), dtype='Int64'),
+            'hazmat_flag': pd.array(rng.random(count) < 0.03, dtype='boolean'),
+            'arrival_date': arrival,
+            'departure_date': departure.array,
+        }, columns=PORT_OPERATIONS_COLUMNS)
+
+
+def generate_container_logs(container_count, rows, seed=0, chunk_size=GENERATE_CHUNK_SIZE,
+                            start=datetime(2022, 1, 1, tzinfo=timezone.utc), days=3 * 365):
+    """container_logs tablosu için, ilk container_count konteynere ait durum/lokasyon değişikliği parçaları üretir."""
+    for chunk_index, chunk_start in enumerate(range(0, rows, chunk_size)):
+        count = min(chunk_size, rows - chunk_start)
+        rng = np.random.default_rng([seed, 1, chunk_index])
+        yield pd.DataFrame({
+            'container_id': generate_container_ids(rng.integers(0, container_count, count), seed),
+            'operation_type': rng.choice(['Update', 'Transition', 'Import'], count),
+            'old_status': rng.choice(CONTAINER_STATUSES, count),
+            'new_status': rng.choice(CONTAINER_STATUSES, count),
+            'old_location': rng.choice(LOCATION_AREAS, count),
+            'new_location': rng.choice(LOCATION_AREAS, count),
+            'operation_time': _random_times(rng, count, start, days).tz_localize(None),
+        })
+
+
+def generate_user_actions(rows, seed=0, chunk_size=GENERATE_CHUNK_SIZE, start=datetime(2022, 1, 1, tzinfo=timezone.utc), days=3 * 365):
+    """user_actions_log tablosu için kullanıcı eylemi parçaları üretir (action_id sunucuda atanır)."""
+    for chunk_index, chunk_start in enumerate(range(0, rows, chunk_size)):
+        count = min(chunk_size, rows - chunk_start)
+        rng = np.random.default_rng([seed, 2, chunk_index])
+        usernames = rng.choice(USERNAMES, count)
+        action_types = rng.choice(USER_ACTION_TYPES, count)
+        yield pd.DataFrame({
+            'username': usernames,
+            'action_type': action_types,
+            'description': [f"{user}: {action} #{chunk_start + index}"
+                            for index, (user, action) in enumerate(zip(usernames, action_types))],
+            'action_time': _random_times(rng, count, start, days).tz_localize(None),
+        })
+
+
+def generate_vessel_tariffs(vessels, seed=0):
+    """Gemilerin %90'ı için günlük tarife üretir (tarifesi olmayan gemiler faturada 0 olarak kalır)."""
+    rng = np.random.default_rng([seed, 3])
+    with_tariff = [name for name in vessels if rng.random() < 0.9]
+    return pd.DataFrame({'vessel_name': with_tariff, 'daily_rate': np.round(rng.uniform(50, 500, len(with_tariff)), 2)})
+
+
+def write_port_operations_csv(rows, path, seed=0):
+    """Sentetik port_operations verisini parça parça CSV'ye yazar; kullanılan gemi adlarını döndürür."""
+    vessels = set()
+    for index, chunk in enumerate(generate_port_operations(rows, seed)):
+        chunk.to_csv(path, mode='w' if index == 0 else 'a', header=index == 0, index=False,
+                     encoding='utf-8-sig' if index == 0 else 'utf-8')
+        vessels.update(chunk['vessel_name'])
+    return sorted(vessels)
+
+
+class FrameSource:
+    """
+    Bellekteki bir port_operations DataFrame'ini ReportGenerator'a veri kaynağı olarak sunar (aggregate_in_db=False ile).
+    DBManager'ın raporlarda kullanılan okuma metotlarıyla aynı arayüze sahiptir; veritabanı gerektirmez.
+    """
+    def __init__(self, port_operations, vessel_tariffs):
+        self.port_operations = port_operations
+        self.vessel_tariffs = vessel_tariffs
+
+    def iter_port_operations_data(self, columns=None, chunk_size=10000, newest_first=False):
+        df = self.port_operations[list(columns) if columns else PORT_OPERATIONS_COLUMNS]
+        if newest_first:
+            df = df.sort_values('timestamp', ascending=False)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size].copy()
+
+    def get_cached_vessel_tariffs(self):
+        return self.vessel_tariffs
+
+
+class BenchmarkRunner:
+    """Ölçümleri çalıştırır ve sonuçları toplar. Her ölçüm repeat kez tekrarlanır; en iyi süre esas alınır."""
+    def __init__(self, repeat=3, only=None, skip=None):
+        self.repeat = repeat
+        self.only = set(only or [])
+        self.skip = set(skip or [])
+        self.results = []
+
+    def enabled(self, name):
+        return (not self.only or name in self.only) and name not in self.skip
+
+    def measure(self, name, group, fn, repeat=None, rows=None):
+        """fn()'i zamanlar. fn bir sözlük döndürürse (örn. rapor veri/çizim süreleri) son çalıştırmanınki 'details' olarak eklenir."""
+        if not self.enabled(name):
+            return None
+        result = {'name': name, 'group': group, 'rows': rows, 'runs': [], 'seconds': None, 'details': None, 'error': None}
+        for _ in range(repeat or self.repeat):
+            started = time.perf_counter()
+            try:
+                details = fn()
+            except Exception as e:
+                result['error'] = str(e)
+                break
+            result['runs'].append(time.perf_counter() - started)
+            if isinstance(details, dict):
+                result['details'] = details
+        if result['runs']:
+            result['seconds'] = min(result['runs'])
+        self.results.append(result)
+        status = f"{result['seconds']:10.3f} sn" if result['seconds'] is not None else f"HATA: {result['error']}"
+        print(f"[{group:8}] {name:40} {status}")
+        return result
+
+
+def _report_specs(vessel_name):
+    """Ölçülen rapor listesi: parametresiz tüm raporlar, tüm veri için fatura raporu ve bir gemiye özel fatura raporu."""
+    specs = [(name, ()) for name, (_, _, takes_args) in REPORT_TYPES.items() if not takes_args]
+    specs.append(('billing', (None, None, 'monthly')))
+    specs.append(('vessel_billing', (vessel_name, datetime(2022, 1, 1), datetime(2024, 12, 31), 'monthly')))
+    return specs
+
+
+def _measure_reports(runner, source, vessel_name, output_dir, aggregate_in_db, group, suffix=''):
+    """Her raporu ayrı ayrı (veri paylaşımı olmadan) hazırlar ve Agg ile PNG'ye çizer. Ölçüm adı 'report:<rapor><suffix>' olur."""
+    for report_name, args in _report_specs(vessel_name):
+        def run(report_name=report_name, args=args):
+            result = render_report_batch(source, [(report_name, args)], output_dir, 'png', max_workers=0,
+                                         aggregate_in_db=aggregate_in_db)[0]
+            if result['error']:
+                raise RuntimeError(result['error'])
+            return {'data_seconds': result['data_seconds'], 'render_seconds': result['render_seconds']}
+        runner.measure(f"report:{report_name}{suffix}", group, run)
+
+
+def run_pandas_benchmarks(runner, rows, seed, work_dir):
+    """Veritabanı gerektirmeyen yollar: CSV dışa aktarma, içe aktarma doğrulaması, pandas ile raporlar ve faturalandırma."""
+    started = time.perf_counter()
+    df = pd.concat(generate_port_operations(rows, seed), ignore_index=True)
+    tariffs = generate_vessel_tariffs(sorted(df['vessel_name'].unique()), seed)
+    print(f"[generate] {rows} satır {time.perf_counter() - started:.2f} sn içinde üretildi.")
+
+    csv_path = os.path.join(work_dir, 'port_operations_pandas.csv')
+    runner.measure('csv_export', 'pandas', lambda: df.to_csv(csv_path, index=False, encoding='utf-8-sig'), rows=rows)
+    if os.path.exists(csv_path):
+        def validate_csv():
+            rejected = 0
+            for chunk in read_csv_in_chunks(csv_path, 50000, dtype=str):
+                rejected += len(prepare_port_operations_frame(chunk)[1])
+            return {'rejected': rejected}
+        runner.measure('csv_import_validation', 'pandas', validate_csv, rows=rows)
+
+    reporter = ReportGenerator(FrameSource(df, tariffs), aggregate_in_db=False, interactive=False)
+    runner.measure('billing_details', 'pandas', lambda: reporter.calculate_billing_details(df, tariffs), rows=rows)
+    _measure_reports(runner, FrameSource(df, tariffs), tariffs['vessel_name'].iloc[len(tariffs) // 2],
+                     os.path.join(work_dir, 'reports_pandas'), False, 'pandas', ':memory')
+
+
+def _copy_frames(db, table, frames):
+    """DataFrame parçalarını COPY FROM STDIN ile tabloya yükler (ölçüm dışı hazırlık adımı)."""
+    with db.transaction() as conn:
+        with conn.cursor() as cur:
+            for df in frames:
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cur.copy_expert(f"COPY public.{table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def run_db_benchmarks(runner, db, rows, seed, work_dir):
+    """Veritabanı yolları: içe aktarma, arama, tümünü getirme, dışa aktarma, raporlar, faturalandırma ve toplu yazma."""
+    db.check_and_create_tables()
+    db.execute_query(f"TRUNCATE public.port_operations, public.vessel_tariffs, {', '.join(f'public.{t}' for t in LOG_TABLES)} CASCADE;")
+
+    csv_path = os.path.join(work_dir, 'port_operations.csv')
+    started = time.perf_counter()
+    vessels = write_port_operations_csv(rows, csv_path, seed)
+    print(f"[generate] {rows} satır {time.perf_counter() - started:.2f} sn içinde CSV'ye yazıldı.")
+
+    # İçe aktarma tabloyu doldurur; tekrarlanmaz (ikinci çalıştırma güncelleme yolunu ölçerdi).
+    # Ölçüm atlanırsa tablo yine de doldurulur.
+    if runner.measure('import_port_operations', 'import', lambda: db.import_data_from_csv('port_operations', csv_path),
+                      repeat=1, rows=rows) is None:
+        db.import_data_from_csv('port_operations', csv_path)
+
+    started = time.perf_counter()
+    tariffs = generate_vessel_tariffs(vessels, seed)
+    _copy_frames(db, 'vessel_tariffs', [tariffs])
+    _copy_frames(db, 'container_logs', generate_container_logs(rows, rows * CONTAINER_LOGS_PER_OPERATION, seed))
+    _copy_frames(db, 'user_actions_log', generate_user_actions(int(rows * USER_ACTIONS_PER_OPERATION), seed))
+    db.rebuild_port_operations_summary()
+    db.execute_query("ANALYZE;")
+    print(f"[setup   ] Log, tarife ve özet tabloları {time.perf_counter() - started:.2f} sn içinde hazırlandı.")
+
+    # Her tekrarda farklı bir konteyner aranır (sunucu önbelleğinin tek satırı ölçmesini önlemek için)
+    sample_ids = itertools.cycle(generate_container_ids(np.random.default_rng([seed, 4]).integers(0, rows, runner.repeat), seed))
+    vessel_name = tariffs['vessel_name'].iloc[len(tariffs) // 2] # Gemiye özel fatura raporu için tarifesi olan bir gemi
+
+    runner.measure('search_by_container_id', 'search', lambda: db.get_port_operation_by_container_id(next(sample_ids)))
+    runner.measure('search_vessel', 'search', lambda: db.search_port_operations({'vessel_name': vessel_name}))
+    runner.measure('search_page_first', 'search', lambda: db.search_port_operations_page({'container_status': 'Full'}, 500))
+    runner.measure('search_container_logs', 'search', lambda: db.get_container_logs(next(sample_ids)))
+    runner.measure('search_user_action_logs_page', 'search',
+                   lambda: db.search_user_action_logs_page({'action_type': 'Report'}, 500))
+    runner.measure('get_all_port_operations', 'get_all', db.get_all_port_operations_data, rows=rows)
+    runner.measure('get_all_container_logs', 'get_all', db.get_all_logs, rows=rows * CONTAINER_LOGS_PER_OPERATION)
+    runner.measure('get_all_user_action_logs', 'get_all', db.get_all_user_action_logs,
+                   rows=int(rows * USER_ACTIONS_PER_OPERATION))
+
+    export_path = os.path.join(work_dir, 'port_operations_export.csv')
+    runner.measure('export_port_operations', 'export', lambda: db.export_table_to_csv('port_operations', export_path), rows=rows)
+    for export_format in ('csv.gz', 'parquet'):
+        format_path = os.path.join(work_dir, f'port_operations_export.{export_format}')
+        runner.measure(f'export_port_operations:{export_format}', 'export',
+                       lambda path=format_path: db.export_port_operations(path), rows=rows)
+    runner.measure('export_search_results', 'export',
+                   lambda: db.export_port_operations(export_path, {'container_status': 'Full'}))
+
+    # Sayımlar veritabanında (özet tablosu) ve tüm veri çekilip pandas ile
+    _measure_reports(runner, db, vessel_name, os.path.join(work_dir, 'reports_db'), True, 'report')
+    _measure_reports(runner, db, vessel_name, os.path.join(work_dir, 'reports_db'), False, 'report', ':pandas')
+
+    # Yerel sütunlu kopya (pyarrow gerekir): tam oluşturma, değişiklik yokken yenileme ve kopya üzerinden raporlar
+    snapshot = PortOperationsSnapshot(db, os.path.join(work_dir, 'snapshot'))
+    runner.measure('snapshot_full_refresh', 'snapshot', lambda: snapshot.refresh(full=True), repeat=1, rows=rows)
+    runner.measure('snapshot_unchanged_refresh', 'snapshot', snapshot.refresh)
+    _measure_reports(runner, snapshot, vessel_name, os.path.join(work_dir, 'reports_snapshot'), True, 'report', ':snapshot')
+
+    run_bulk_write_benchmarks(runner, db, rows, seed)
+
+
+def run_bulk_write_benchmarks(runner, db, rows, seed):
+    """
+    add/update/delete_port_operations çağrılarını aynı BULK_WRITE_ROWS satır üzerinde tek satırlık döngüyle karşılaştırır.
+    Satırlar tabloda olmayan yeni konteyner numaralarıyla üretilir ve sonunda silinir. Hızlanma oranı toplu ölçümün
+    'details' alanına yazılır.
+    """
+    frame = next(generate_port_operations(BULK_WRITE_ROWS, seed + 1))
+    frame['container_id'] = generate_container_ids(np.arange(rows, rows + BULK_WRITE_ROWS), seed)
+    records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+    container_ids = [record['container_id'] for record in records]
+    changes = [
+        {'container_id': container_id, 'container_status': 'On Hold', 'location_area': LOCATION_AREAS[index % len(LOCATION_AREAS)]}
+        for index, container_id in enumerate(container_ids)
+    ]
+
+    def single_add():
+        for record in records:
+            db.add_port_operation(record)
+
+    def single_update():
+        for change in changes:
+            db.update_port_operation(change['container_id'], {key: value for key, value in change.items() if key != 'container_id'})
+
+    def single_delete():
+        for container_id in container_ids:
+            db.delete_port_operation(container_id)
+
+    # Her adım tablonun durumunu değiştirdiği için bir kez çalışır; tek satırlık döngü ve toplu çağrı aynı satırları işler
+    steps = [
+        ('add', single_add, lambda: db.add_port_operations(records)),
+        ('update', single_update, lambda: db.update_port_operations(changes)),
+        ('delete', single_delete, lambda: db.delete_port_operations(container_ids)),
+    ]
+    single_results = {}
+    for name, single, _ in steps:
+        single_results[name] = runner.measure(f'write_single:{name}', 'write', single, repeat=1, rows=BULK_WRITE_ROWS)
+    for name, _, bulk in steps:
+        result = runner.measure(f'write_bulk:{name}', 'write', bulk, repeat=1, rows=BULK_WRITE_ROWS)
+        single = single_results[name]
+        if result and result['seconds'] and single and single['seconds']:
+            speedup = single['seconds'] / result['seconds']
+            result['details'] = {'speedup': round(speedup, 1)}
+            print(f"[write   ] {name}: {BULK_WRITE_ROWS} satırda toplu yazma tek satırlık döngüden x{speedup:.1f} hızlı")
+
+
+def compare_results(current, baseline_path):
+    """Önceki bir çalıştırmanın JSON çıktısıyla karşılaştırır (oran < 1: daha hızlı)."""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = {entry['name']: entry for entry in json.load(handle)['results']}
+    print(f"\nKarşılaştırma ({baseline_path}):")
+    for entry in current:
+        old = baseline.get(entry['name'])
+        if not old or old['seconds'] is None or entry['seconds'] is None:
+            continue
+        ratio = entry['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        print(f"{entry['name']:40} {old['seconds']:10.3f} -> {entry['seconds']:10.3f} sn  x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DBManager ve ReportGenerator performans ölçümleri")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--scale', choices=sorted(SCALES), default='10k', help="Hazır veri ölçeği (port_operations satır sayısı)")
+    size.add_argument('--rows', type=int, help="port_operations satır sayısı (--scale yerine)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="Her ölçümün tekrar sayısı (en iyi süre raporlanır)")
+    parser.add_argument('--no-db', action='store_true', help="Yalnızca pandas yollarını ölç (veritabanı gerekmez)")
+    parser.add_argument('--dbname', help="Ölçüm veritabanı (tabloları boşaltılır; konfigürasyondaki veritabanı kullanılamaz)")
+    parser.add_argument('--only', nargs='*', help="Yalnızca bu ölçümleri çalıştır")
+    parser.add_argument('--skip', nargs='*', help="Bu ölçümleri atla (örn. 10M satırda get_all_port_operations)")
+    parser.add_argument('--work-dir', help="Üretilen CSV ve rapor dosyalarının dizini (varsayılan: geçici dizin)")
+    parser.add_argument('--output', default='benchmark_results.json', help="Sonuç JSON dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    args = parser.parse_args(argv)
+
+    rows = args.rows or SCALES[args.scale]
+    runner = BenchmarkRunner(repeat=args.repeat, only=args.only, skip=args.skip)
+    meta = {
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'rows': rows,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'mode': 'pandas' if args.no_db else 'db+pandas',
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'server_version': None,
+    }
+
+    with tempfile.TemporaryDirectory(prefix='port_benchmark_') as temp_dir:
+        work_dir = args.work_dir or temp_dir
+        os.makedirs(work_dir, exist_ok=True)
+        if not args.no_db:
+            from config import app_config # Yalnızca veritabanı ölçümlerinde konfigürasyon okunur
+            if not args.dbname:
+                parser.error("Veritabanı ölçümleri için --dbname gerekli (veya --no-db kullanın).")
+            if args.dbname == app_config.DB_NAME:
+                parser.error(f"'{args.dbname}' uygulamanın veritabanı; ölçümler tabloları boşalttığı için ayrı bir veritabanı kullanın.")
+            db = DBManager(**{**app_config.get_db_config(), 'dbname': args.dbname,
+                              'audit_spool_path': os.path.join(work_dir, 'audit_spool.jsonl')})
+            try:
+                meta['server_version'] = db.execute_query("SHOW server_version;", fetch=True)[0][0]
+                run_db_benchmarks(runner, db, rows, args.seed, work_dir)
+            finally:
+                db.close()
+        run_pandas_benchmarks(runner, rows, args.seed, work_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump({'meta': meta, 'results': runner.results}, handle, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar '{args.output}' dosyasına yazıldı.")
+    if args.compare:
+        compare_results(runner.results, args.compare)
+    return 1 if any(entry['error'] for entry in runner.results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,6 +38,33 @@ class Config:
         self.DB_PASSWORD = os.getenv("DB_PASSWORD", config.get('database', 'password', fallback=''))
         self.DB_HOST = os.getenv("DB_HOST", config.get('database', 'host', fallback='localhost'))
         self.DB_PORT = os.getenv("DB_PORT", config.get('database', 'port', fallback='5432'))
+
+        # Bağlantı havuzu ayarları
+        self.DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", config.get('database', 'pool_min', fallback='1')))
+        self.DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", config.get('database', 'pool_max', fallback='10')))
+        self.DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", config.get('database', 'pool_timeout', fallback='30')))
+
+        # CSV içe aktarma ayarları
+        self.IMPORT_CHUNK_SIZE = config.getint('import', 'chunk_size', fallback=50000)
+
+        # Log tabloları: aylık bölümleme ve saklama süresi (0 = sınırsız)
+        self.LOG_PARTITIONING = config.getboolean('logs', 'partitioning', fallback=True)
+        self.LOG_PARTITIONS_AHEAD = config.getint('logs', 'partitions_ahead', fallback=2)
+        self.LOG_RETENTION_MONTHS = config.getint('logs', 'retention_months', fallback=0)
+        self.LOG_RETENTION_ACTION = config.get('logs', 'retention_action', fallback='detach')
+        # Kullanıcı eylem loglarının arka planda toplu yazılması
+        self.AUDIT_BATCH_SIZE = config.getint('logs', 'audit_batch_size', fallback=200)
+        self.AUDIT_FLUSH_INTERVAL = config.getfloat('logs', 'audit_flush_interval', fallback=2.0)
+        self.AUDIT_SPOOL_PATH = config.get('logs', 'audit_spool_path', fallback='audit_spool.jsonl')
+
+        # Sorgu ölçümleri ve yavaş sorgu logu (0 = yavaş sorgu logu kapalı)
+        self.QUERY_INSTRUMENTATION = config.getboolean('diagnostics', 'query_instrumentation', fallback=True)
+        self.SLOW_QUERY_MS = config.getfloat('diagnostics', 'slow_query_ms', fallback=500.0)
+        self.SLOW_QUERY_LOG_SIZE = config.getint('diagnostics', 'slow_query_log_size', fallback=200)
+
+        # Raporlar için port_operations'ın yerel sütunlu kopyası (boş = kapalı; pyarrow gerekir)
+        self.SNAPSHOT_DIR = config.get('snapshot', 'path', fallback='') or None
+        self.SNAPSHOT_OVERLAP_SECONDS = config.getint('snapshot', 'overlap_seconds', fallback=300)
         
          # Şifre kontrolü
         if not self.DB_PASSWORD:
@@ -58,7 +85,31 @@ class Config:
         config.set('database', 'password', '')  # Şifreyi burada saklamıyoruz
         config.set('database', 'host', 'localhost')
         config.set('database', 'port', '5432')
+        config.set('database', 'pool_min', '1')
+        config.set('database', 'pool_max', '10')
+        config.set('database', 'pool_timeout', '30')
         
+        config.add_section('import')
+        config.set('import', 'chunk_size', '50000')
+
+        config.add_section('logs')
+        config.set('logs', 'partitioning', 'true')
+        config.set('logs', 'partitions_ahead', '2')
+        config.set('logs', 'retention_months', '0')
+        config.set('logs', 'retention_action', 'detach')
+        config.set('logs', 'audit_batch_size', '200')
+        config.set('logs', 'audit_flush_interval', '2.0')
+        config.set('logs', 'audit_spool_path', 'audit_spool.jsonl')
+
+        config.add_section('diagnostics')
+        config.set('diagnostics', 'query_instrumentation', 'true')
+        config.set('diagnostics', 'slow_query_ms', '500')
+        config.set('diagnostics', 'slow_query_log_size', '200')
+
+        config.add_section('snapshot')
+        config.set('snapshot', 'path', '')
+        config.set('snapshot', 'overlap_seconds', '300')
+
         config.add_section('ui')
         config.set('ui', 'default_theme', 'Koyu Tema')
         
@@ -77,7 +128,23 @@ class Config:
             'user': self.DB_USER,
             'password': self.DB_PASSWORD,
             'host': self.DB_HOST,
-            'port': self.DB_PORT
+            'port': self.DB_PORT,
+            'minconn': self.DB_POOL_MIN,
+            'maxconn': self.DB_POOL_MAX,
+            'pool_timeout': self.DB_POOL_TIMEOUT,
+            'import_chunk_size': self.IMPORT_CHUNK_SIZE,
+            'log_partitioning': self.LOG_PARTITIONING,
+            'log_partitions_ahead': self.LOG_PARTITIONS_AHEAD,
+            'log_retention_months': self.LOG_RETENTION_MONTHS,
+            'log_retention_action': self.LOG_RETENTION_ACTION,
+            'audit_batch_size': self.AUDIT_BATCH_SIZE,
+            'audit_flush_interval': self.AUDIT_FLUSH_INTERVAL,
+            'audit_spool_path': self.AUDIT_SPOOL_PATH,
+            'query_instrumentation': self.QUERY_INSTRUMENTATION,
+            'slow_query_ms': self.SLOW_QUERY_MS,
+            'slow_query_log_size': self.SLOW_QUERY_LOG_SIZE,
+            'snapshot_dir': self.SNAPSHOT_DIR,
+            'snapshot_overlap_seconds': self.SNAPSHOT_OVERLAP_SECONDS
         }
     
     def validate_db_config(self):
@@ -0,0 +1,124 @@
+"""
+Veritabanı bakım araçları (komut satırı).
+
+Kullanım:
+    python db_tools.py indexes    # Eksik indeks sürümlerini uygular
+    python db_tools.py explain    # Standart sorgular için EXPLAIN ANALYZE çalıştırır, Seq Scan yapanları raporlar
+    python db_tools.py summary-rebuild  # Rapor özet tablosunu port_operations'tan yeniden hesaplar
+    python db_tools.py summary-verify   # Özet tablosunu tam sayımla karşılaştırır
+    python db_tools.py partition-logs   # Bölümlenmemiş log tablolarını aylık bölümlü tablolara dönüştürür
+    python db_tools.py log-maintenance  # Gelecek aylar için log bölümlerini açar, saklama süresini uygular
+    python db_tools.py snapshot-refresh [--full]  # Raporların yerel port_operations kopyasını günceller
+"""
+import argparse
+import sys
+
+from config import app_config
+from db_operations import DBManager, LOG_TABLES
+
+
+def cmd_indexes(db, args):
+    """Henüz uygulanmamış indeks sürümlerini uygular."""
+    applied = db.ensure_schema_indexes()
+    if applied:
+        print(f"Uygulanan indeks sürümleri: {', '.join(str(v) for v in applied)}")
+    else:
+        print("Tüm indeks sürümleri zaten uygulanmış.")
+    return 0
+
+
+def cmd_explain(db, args):
+    """Standart sorguların planlarını gösterir; Seq Scan kalan sorgu varsa 1 ile çıkar."""
+    report = db.explain_canonical_queries()
+    seq_scan_found = False
+    for entry in report:
+        status = "SEQ SCAN" if entry['seq_scans'] else "OK"
+        seq_scan_found = seq_scan_found or bool(entry['seq_scans'])
+        print(f"[{status:8}] {entry['query']:30} {entry['execution_ms'] or 0:10.2f} ms")
+        if entry['indexes']:
+            print(f"           indeksler: {', '.join(entry['indexes'])}")
+        if entry['seq_scans']:
+            print(f"           sıralı tarama: {', '.join(entry['seq_scans'])}")
+    if seq_scan_found:
+        print("\nNot: Küçük tablolarda PostgreSQL indeks yerine sıralı taramayı seçebilir; "
+              "sonuçları gerçekçi veri hacmiyle ve ANALYZE sonrasında değerlendirin.")
+    return 1 if seq_scan_found else 0
+
+
+def cmd_summary_rebuild(db, args):
+    """Özet tablosunu port_operations'ın tamamından yeniden hesaplar."""
+    row_count = db.rebuild_port_operations_summary()
+    print(f"Özet tablosu yeniden hesaplandı: {row_count} satır.")
+    return 0
+
+
+def cmd_summary_verify(db, args):
+    """Özet tablosu tam sayımla uyuşmuyorsa farkları listeler ve 1 ile çıkar."""
+    mismatches = db.verify_port_operations_summary()
+    for entry in mismatches:
+        print(f"{entry['dimension']:16} {entry['bucket']:30} beklenen={entry['expected']:<10} özet={entry['actual']}")
+    if mismatches:
+        print(f"\n{len(mismatches)} uyuşmayan satır bulundu. 'summary-rebuild' ile yeniden hesaplayabilirsiniz.")
+        return 1
+    print("Özet tablosu tutarlı.")
+    return 0
+
+
+def cmd_partition_logs(db, args):
+    """Bölümlenmemiş log tablolarını aylık bölümlü tablolara dönüştürür."""
+    for table in LOG_TABLES:
+        copied = db.convert_log_table_to_partitioned(table)
+        if copied is None:
+            print(f"'{table}' zaten bölümlü.")
+    return 0
+
+
+def cmd_log_maintenance(db, args):
+    """Eksik log bölümlerini oluşturur ve (ayarlandıysa) saklama süresi dolan bölümleri ayırır/siler."""
+    created = db.ensure_log_partitions()
+    processed = db.apply_log_retention()
+    if not created and not processed:
+        print("Log bölümleri güncel.")
+    return 0
+
+
+def cmd_snapshot_refresh(db, args):
+    """Yerel sütunlu kopyayı yalnızca yeni satırları çekerek (--full ile baştan) günceller."""
+    if db.snapshot is None:
+        print("Yerel kopya kapalı. app.ini [snapshot] path ayarını yapın.")
+        return 2
+    result = db.snapshot.refresh(full=args.full)
+    print(f"Yerel kopya ({result['mode']}): {result['rows']} satır, {result['delta_rows']} yeni/değişen, {result['seconds']:.2f} sn.")
+    return 0
+
+
+COMMANDS = {
+    'indexes': cmd_indexes,
+    'explain': cmd_explain,
+    'summary-rebuild': cmd_summary_rebuild,
+    'summary-verify': cmd_summary_verify,
+    'partition-logs': cmd_partition_logs,
+    'log-maintenance': cmd_log_maintenance,
+    'snapshot-refresh': cmd_snapshot_refresh,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konteyner veritabanı bakım araçları")
+    parser.add_argument('command', choices=sorted(COMMANDS), help="Çalıştırılacak komut")
+    parser.add_argument('--full', action='store_true', help="snapshot-refresh: kopyayı baştan oluştur")
+    args = parser.parse_args(argv)
+
+    if not app_config.DB_PASSWORD:
+        print("Veritabanı şifresi bulunamadı! DB_PASSWORD tanımlanmalı.")
+        return 2
+
+    db = DBManager(**app_config.get_db_config())
+    try:
+        return COMMANDS[args.command](db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,31 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QGridLayout, QLabel, QLineEdit, QPushButton,
     QComboBox, QMessageBox, QTableView, QHeaderView, QDialog, QFormLayout,
     QDateEdit, QDateTimeEdit, QCheckBox, QSpinBox, QDoubleSpinBox, QGroupBox,
-    QFileDialog, QStatusBar
+    QFileDialog, QStatusBar, QProgressDialog, QProgressBar, QStackedWidget
 )
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QDate, QDateTime, QRegExp
 from PyQt5.QtGui import QFont, QRegExpValidator
 
 # Mevcut bağımlılıklar
-from db_operations import DBManager
-from reports import ReportGenerator
+from db_operations import DBManager, export_format_for_path, concat_port_operations_frames
+from reports import ReportGenerator, ReportDataError, REPORT_TYPES, update_report_figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from collections import OrderedDict
+from background_tasks import TaskRunner
 from datetime import datetime, timedelta # timedelta da eklendi
+from dateutil.tz import tzlocal
 import pandas as pd
 import re
 
+# Sorgu sekmesinde her seferinde veritabanından çekilen satır sayısı
+QUERY_PAGE_SIZE = 500
+# Dışa aktarma dosya filtreleri -> (biçim, uzantı); "Tüm Dosyalar" seçilirse biçim uzantıdan belirlenir
+EXPORT_FILE_FILTERS = {
+    "CSV Dosyaları (*.csv)": ('csv', '.csv'),
+    "Sıkıştırılmış CSV (*.csv.gz)": ('csv.gz', '.csv.gz'),
+    "Parquet Dosyaları (*.parquet)": ('parquet', '.parquet'),
+}
+
 def calculate_iso6346_check_digit(container_id_without_check_digit):
     """
     ISO 6346 standardına göre bir konteyner numarasının kontrol basamağını (check digit) DOĞRU şekilde hesaplar.
@@ -49,11 +62,111 @@ def calculate_iso6346_check_digit(container_id_without_check_digit):
     return 0 if check_digit == 10 else check_digit
 
 
+# Tablo başlıklarında gösterilecek okunaklı sütun adları
+HEADER_LABELS = {
+    "vessel_name": "Gemi Adı",
+    "imo_number": "IMO Numarası",
+    "arrival_port": "Varış Limanı",
+    "departure_port": "Kalkış Limanı",
+    "container_id": "Konteyner Numarası",
+    "container_size": "Konteyner Boyutu",
+    "container_type": "Konteyner Tipi",
+    "operation_type": "Operasyon Tipi",
+    "timestamp": "Genel İşlem Zamanı",
+    "terminal_name": "Terminal Adı",
+    "transport_mode": "Taşıma Modu",
+    "container_status": "Konteyner Durumu",
+    "location_area": "Lokasyon Alanı",
+    "handling_equipment": "Elleçleme Ekipmanı",
+    "customs_clearance_status": "Gümrük Durumu",
+    "weight_kg": "Ağırlık (kg)",
+    "hazmat_flag": "Tehlikeli Madde",
+    "arrival_date": "Limana Giriş Tarihi",
+    "departure_date": "Limandan Çıkış Tarihi",
+    "log_id": "Log ID",
+    "action_id": "Eylem ID",
+    "username": "Kullanıcı Adı",
+    "action_type": "Eylem Tipi",
+    "description": "Açıklama",
+    "action_time": "Eylem Zamanı",
+    "id": "Kullanıcı ID", # Kullanıcı yönetimi için
+    "password_hash": "Şifre Hash", # Kullanıcı yönetimi için
+    # Sorgu tanılama penceresi için
+    "caller": "Metot",
+    "fingerprint": "Sorgu",
+    "calls": "Çağrı",
+    "errors": "Hata",
+    "queries": "Farklı Sorgu",
+    "total_ms": "Toplam (ms)",
+    "fetch_ms": "Okuma (ms)",
+    "mean_ms": "Ortalama (ms)",
+    "p50_ms": "p50 (ms)",
+    "p95_ms": "p95 (ms)",
+    "max_ms": "En Uzun (ms)",
+    "duration_ms": "Süre (ms)",
+    "rows": "Satır",
+    "bytes": "Bayt (yaklaşık)",
+    "params": "Parametreler (gizli)",
+    "time": "Zaman",
+    "error": "Hata Mesajı"
+}
+RIGHT_ALIGNED_COLUMNS = ['imo_number', 'container_size', 'weight_kg', 'calls', 'errors', 'queries', 'total_ms', 'fetch_ms',
+                         'mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'duration_ms', 'rows', 'bytes']
+DISPLAY_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Saat dilimli (örn. UTC) tarihler tabloda ve formlarda bu makinenin yerel saatiyle gösterilir
+LOCAL_TIMEZONE = tzlocal()
+
+
+def format_column_for_display(series):
+    """
+    Bir sütunu tabloda gösterilecek string listesine çevirir: NaN/NaT/NA boş string, tarihler (saat dilimliyse yerel saate
+    çevrilerek) DISPLAY_DATETIME_FORMAT, boolean değerler Evet/Hayır olur; diğer değerler (category dahil) str() ile gösterilir.
+    """
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if series.dt.tz is not None:
+            series = series.dt.tz_convert(LOCAL_TIMEZONE)
+        formatted = series.dt.strftime(DISPLAY_DATETIME_FORMAT)
+    elif pd.api.types.is_bool_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+        formatted = series.map({True: "Evet", False: "Hayır"})
+    elif pd.api.types.infer_dtype(series, skipna=True) in ('datetime', 'datetime64', 'date'):
+        # Farklı zaman dilimli tarihler object sütunda kalır; bunlar tek tek biçimlendirilir
+        formatted = pd.Series([value.strftime(DISPLAY_DATETIME_FORMAT) if not is_missing else ""
+                               for value, is_missing in zip(series, missing)], index=series.index)
+    else:
+        formatted = series.astype(str)
+    return formatted.mask(missing, "").tolist()
+
+
+def frame_row_to_dict(dataframe, row):
+    """DataFrame'in bir satırını, eksik (NaN/NaT/NA) değerleri None olan bir sözlüğe çevirir (formlara veri aktarmak için)."""
+    return {column: (None if pd.isna(value) else value) for column, value in dataframe.iloc[row].items()}
+
+
 # QTableView için özel PandasModel
 class PandasModel(QAbstractTableModel):
+    """
+    DataFrame'i gösteren tablo modeli. Hücre metinleri, hizalamalar ve başlıklar setDataFrame sırasında
+    sütun bazında bir kez hazırlanır; data() ve headerData() yalnızca hazır listelerden okur.
+    """
     def __init__(self, df=pd.DataFrame()):
         super().__init__()
-        self._data = df
+        self._set_data(df)
+
+    def _set_data(self, dataframe):
+        self._data = dataframe
+        self._display_columns = self._format_frame(dataframe)
+        self._alignments = [
+            Qt.AlignRight | Qt.AlignVCenter if column in RIGHT_ALIGNED_COLUMNS else Qt.AlignLeft | Qt.AlignVCenter
+            for column in dataframe.columns
+        ]
+        self._header_labels = [
+            HEADER_LABELS.get(column, str(column).replace('_', ' ').title()) for column in dataframe.columns
+        ]
+
+    @staticmethod
+    def _format_frame(dataframe):
+        return [format_column_for_display(dataframe.iloc[:, col]) for col in range(dataframe.shape[1])]
 
     def rowCount(self, parent=QModelIndex()):
         return self._data.shape[0]
@@ -65,70 +178,131 @@ class PandasModel(QAbstractTableModel):
         if not index.isValid():
             return QVariant()
         if role == Qt.DisplayRole:
-            value = self._data.iloc[index.row(), index.column()]
-            if pd.isna(value): # NaN değerleri boş string olarak göster
-                return ""
-            # Tarih formatlama
-            if isinstance(value, (datetime, pd.Timestamp)):
-                return value.strftime('%Y-%m-%d %H:%M:%S')
-            # Boolean değerler için
-            if isinstance(value, bool):
-                return "Evet" if value else "Hayır"
-            return str(value)
+            return self._display_columns[index.column()][index.row()]
         elif role == Qt.TextAlignmentRole:
-            # Sütunlara göre hizalama ayarı
-            if self._data.columns[index.column()] in ['imo_number', 'container_size', 'weight_kg']:
-                return Qt.AlignRight | Qt.AlignVCenter
-            return Qt.AlignLeft | Qt.AlignVCenter
+            return self._alignments[index.column()]
         return QVariant()
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole:
             if orientation == Qt.Horizontal:
-                # Sütun isimlerini daha okunaklı hale getirebiliriz
-                header_map = {
-                    "vessel_name": "Gemi Adı",
-                    "imo_number": "IMO Numarası",
-                    "arrival_port": "Varış Limanı",
-                    "departure_port": "Kalkış Limanı",
-                    "container_id": "Konteyner Numarası",
-                    "container_size": "Konteyner Boyutu",
-                    "container_type": "Konteyner Tipi",
-                    "operation_type": "Operasyon Tipi",
-                    "timestamp": "Genel İşlem Zamanı",
-                    "terminal_name": "Terminal Adı",
-                    "transport_mode": "Taşıma Modu",
-                    "container_status": "Konteyner Durumu",
-                    "location_area": "Lokasyon Alanı",
-                    "handling_equipment": "Elleçleme Ekipmanı",
-                    "customs_clearance_status": "Gümrük Durumu",
-                    "weight_kg": "Ağırlık (kg)",
-                    "hazmat_flag": "Tehlikeli Madde",
-                    "arrival_date": "Limana Giriş Tarihi",
-                    "departure_date": "Limandan Çıkış Tarihi",
-                    "log_id": "Log ID",
-                    "action_id": "Eylem ID",
-                    "username": "Kullanıcı Adı",
-                    "action_type": "Eylem Tipi",
-                    "description": "Açıklama",
-                    "action_time": "Eylem Zamanı",
-                    "id": "Kullanıcı ID", # Kullanıcı yönetimi için
-                    "password_hash": "Şifre Hash" # Kullanıcı yönetimi için
-                }
-                return header_map.get(self._data.columns[section], self._data.columns[section].replace('_', ' ').title())
+                return self._header_labels[section]
             elif orientation == Qt.Vertical:
                 return str(section + 1)
         return QVariant()
 
     def setDataFrame(self, dataframe):
         self.beginResetModel()
-        self._data = dataframe
+        self._set_data(dataframe)
         self.endResetModel()
 
     def getDataFrame(self):
         return self._data
 
 
+# Sorgu sonuçlarını sayfa sayfa yükleyen model: QTableView sona yaklaşınca canFetchMore/fetchMore ile sonraki sayfayı çeker
+class LazyPandasModel(PandasModel):
+    def __init__(self, df=pd.DataFrame(), task_runner=None):
+        """task_runner verilirse sonraki sayfalar arka planda çekilir; verilmezse fetchMore sorguyu doğrudan çalıştırır."""
+        self._task_runner = task_runner
+        self._source_generation = 0 # Sayfa kaynağı her değiştiğinde artar; eski kaynaktan gelen sayfalar yok sayılır
+        self._fetch_in_flight = False
+        self._fetch_page = None
+        self._next_key = None
+        super().__init__(df)
+
+    def _set_page_source(self, fetch_page, next_key):
+        self._source_generation += 1
+        self._fetch_in_flight = False
+        self._fetch_page = fetch_page
+        self._next_key = next_key
+
+    def setPageSource(self, fetch_page, first_page=None):
+        """
+        fetch_page(after_key) -> (DataFrame, next_key) şeklinde bir sayfa kaynağı bağlar ve ilk sayfayı yükler.
+        first_page (arka planda önceden çekilmiş (DataFrame, next_key)) verilirse ilk sayfa için sorgu atılmaz.
+        next_key None olduğunda başka sayfa yoktur.
+        """
+        df, next_key = first_page if first_page is not None else fetch_page(None)
+        super().setDataFrame(df)
+        self._set_page_source(fetch_page, next_key)
+
+    def _set_data(self, dataframe):
+        super()._set_data(dataframe)
+        # fetchMore ile gelen sayfalar burada biriktirilir; _data ile yalnızca getDataFrame çağrıldığında birleştirilir
+        # (her sayfada tüm birikmiş tabloyu yeniden birleştirmek uzun kaydırmalarda O(n²) olurdu)
+        self._pending_pages = []
+        self._row_count = dataframe.shape[0]
+
+    def rowCount(self, parent=QModelIndex()):
+        return self._row_count
+
+    def getDataFrame(self):
+        if self._pending_pages:
+            self._data = concat_port_operations_frames([self._data] + self._pending_pages)
+            self._pending_pages = []
+        return self._data
+
+    def setDataFrame(self, dataframe):
+        # Doğrudan verilen DataFrame'in devam sayfası yoktur
+        self._set_page_source(None, None)
+        super().setDataFrame(dataframe)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        # Bir sayfa yüklenirken ikinci bir istek başlatılmaz
+        return self._fetch_page is not None and self._next_key is not None and not self._fetch_in_flight
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        generation = self._source_generation
+        if self._task_runner is None:
+            try:
+                page = self._fetch_page(self._next_key)
+            except Exception as e:
+                self._on_page_failed(generation, e)
+                return
+            self._on_page_loaded(generation, page)
+            return
+
+        self._fetch_in_flight = True
+        self._task_runner.run(self._fetch_page, self._next_key,
+                              on_success=lambda page: self._on_page_loaded(generation, page),
+                              on_error=lambda e: self._on_page_failed(generation, e),
+                              on_cancelled=lambda: self._on_page_cancelled(generation))
+
+    def _on_page_loaded(self, generation, page):
+        if generation != self._source_generation:
+            return # Bu arada yeni bir sorgu bağlandı
+        self._fetch_in_flight = False
+        df, next_key = page
+        self._next_key = next_key
+        if df.empty:
+            return
+        first_row = self._row_count
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(df) - 1)
+        self._pending_pages.append(df)
+        self._row_count += len(df)
+        # Yalnızca yeni sayfa biçimlendirilir; önceki satırların metinleri yeniden hesaplanmaz
+        for display_values, new_values in zip(self._display_columns, self._format_frame(df)):
+            display_values.extend(new_values)
+        self.endInsertRows()
+
+    def _on_page_failed(self, generation, error):
+        if generation != self._source_generation:
+            return
+        print(f"Sonraki sayfa yüklenirken hata: {error}")
+        self._fetch_in_flight = False
+        self._next_key = None
+
+    def _on_page_cancelled(self, generation):
+        # İptal edilen sayfa kaydırmaya devam edildiğinde yeniden istenebilir
+        if generation == self._source_generation:
+            self._fetch_in_flight = False
+
+
 class OperationFormDialog(QDialog):
     def __init__(self, parent=None, db_manager=None, data=None):
         super().__init__(parent)
@@ -219,6 +393,8 @@ class OperationFormDialog(QDialog):
                 elif isinstance(input_widget, QDateTimeEdit):
                     if value and pd.notna(value): # Pandas NaT kontrolü
                         dt_value = value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+                        if dt_value.tzinfo is not None:
+                            dt_value = dt_value.astimezone(LOCAL_TIMEZONE)
                         qdt = QDateTime(dt_value.year, dt_value.month, dt_value.day, dt_value.hour, dt_value.minute, dt_value.second)
                         input_widget.setDateTime(qdt)
                     else:
@@ -578,11 +754,109 @@ class UserManagementDialog(QDialog):
         self.role_combo.setCurrentIndex(0) # Varsayılan rolü seç
 
 
+class QueryDiagnosticsDialog(QDialog):
+    """
+    Oturumdaki veritabanı sorgu ölçümlerini gösterir: DBManager metodu bazında toplamlar, sorgu parmak izi bazında
+    süre dağılımı ve yavaş sorgular. Ölçümler sıfırlanabilir veya JSON dosyasına kaydedilebilir.
+    """
+    METHOD_COLUMNS = ['caller', 'calls', 'errors', 'queries', 'total_ms', 'fetch_ms', 'rows', 'bytes']
+    QUERY_COLUMNS = ['caller', 'calls', 'errors', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'fetch_ms', 'rows', 'bytes', 'fingerprint']
+    SLOW_QUERY_COLUMNS = ['time', 'caller', 'duration_ms', 'rows', 'fingerprint', 'params', 'error']
+
+    def __init__(self, parent=None, db_manager=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sorgu Tanılama")
+        self.setGeometry(150, 150, 1100, 600)
+        self.db = db_manager
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        tabs = QTabWidget()
+        self.method_model = PandasModel()
+        self.query_model = PandasModel()
+        self.slow_query_model = PandasModel()
+        for model, title in [(self.method_model, "Metotlar"), (self.query_model, "Sorgular"), (self.slow_query_model, "Yavaş Sorgular")]:
+            view = QTableView()
+            view.setModel(model)
+            view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+            view.horizontalHeader().setStretchLastSection(True)
+            tabs.addTab(view, title)
+        layout.addWidget(tabs)
+
+        buttons = QHBoxLayout()
+        refresh_button = QPushButton("Yenile")
+        refresh_button.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_button)
+        reset_button = QPushButton("Sıfırla")
+        reset_button.clicked.connect(self._reset)
+        buttons.addWidget(reset_button)
+        dump_button = QPushButton("Dosyaya Kaydet")
+        dump_button.clicked.connect(self._dump_to_file)
+        buttons.addWidget(dump_button)
+        buttons.addStretch(1)
+        close_button = QPushButton("Kapat")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    @staticmethod
+    def _frame(records, columns):
+        df = pd.DataFrame(records, columns=columns)
+        return df.round({column: 2 for column in columns if column.endswith('_ms')})
+
+    def refresh(self):
+        by_caller = self.db.get_query_stats_by_caller()
+        queries = self.db.get_query_stats()
+        slow_queries = self.db.get_slow_queries()
+        self.method_model.setDataFrame(self._frame(by_caller, self.METHOD_COLUMNS))
+        self.query_model.setDataFrame(self._frame(queries, self.QUERY_COLUMNS))
+        self.slow_query_model.setDataFrame(self._frame([dict(entry, params=str(entry['params'])) for entry in slow_queries],
+                                                       self.SLOW_QUERY_COLUMNS))
+
+        total_ms = sum(entry['total_ms'] + entry['fetch_ms'] for entry in by_caller)
+        pool = self.db.get_pool_stats()
+        self.summary_label.setText(
+            f"Oturum başlangıcı: {self.db.query_stats.started_at.strftime(DISPLAY_DATETIME_FORMAT)}  |  "
+            f"Sorgu: {sum(entry['calls'] for entry in by_caller)}  |  Toplam süre: {total_ms / 1000:.2f} sn  |  "
+            f"Yavaş sorgu eşiği: {self.db.query_stats.slow_query_ms or 'kapalı'} ms  |  "
+            f"Havuz: {pool['in_use']}/{pool['max_size']} kullanımda, ort. bekleme {pool['wait_time_avg'] * 1000:.1f} ms"
+        )
+
+    def _reset(self):
+        self.db.reset_query_stats()
+        self.refresh()
+
+    def _dump_to_file(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Sorgu Ölçümlerini Kaydet",
+                                                   f"query_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                                                   "JSON Dosyaları (*.json)")
+        if not file_path:
+            return
+        try:
+            self.db.dump_query_stats(file_path)
+            QMessageBox.information(self, "Başarılı", f"Sorgu ölçümleri kaydedildi: {file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Sorgu ölçümleri kaydedilemedi: {e}")
+
+
 class KonteynerSorgulamaApp(QMainWindow):
     def __init__(self, db_manager, current_username, current_user_role, apply_theme_callback):
         super().__init__()
         self.db = db_manager
-        self.reporter = ReportGenerator(self.db)
+        # Grafikler Raporlar sekmesine gömülür (ayrı pyplot penceresi açılmaz). Yerel kopya açıksa raporlar
+        # veritabanı yerine ondan okunur
+        self.reporter = ReportGenerator(self.db.snapshot or self.db, interactive=False,
+                                        notify=lambda title, message: QMessageBox.information(self, title, message))
+        # (rapor adı, parametreler) -> {'versions', 'data', 'canvas'}; en son kullanılanlar sonda
+        self._report_cache = OrderedDict()
+        self._current_report_key = None
+        # Sonuç tablosunu dolduran son arama kriterleri; dışa aktarma bu sorguyu veritabanından yeniden akıtır
+        self._current_search_criteria = None
+        self._search_generation = 0 # Her aramada artar; geç gelen eski arama sonuçları bununla ayırt edilir
         self.current_username = current_username
         self.current_user_role = current_user_role
         self.apply_theme_callback = apply_theme_callback # Tema değiştirme callback'i
@@ -600,12 +874,35 @@ class KonteynerSorgulamaApp(QMainWindow):
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
 
+        # Veritabanı sorguları ve rapor verileri arka planda çalışır; meşgul göstergesi ve iptal butonu durum çubuğunda
+        self.task_runner = TaskRunner(self.db, parent=self)
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0) # Belirsiz (meşgul) gösterge
+        self.busy_indicator.setMaximumWidth(150)
+        self.busy_indicator.setVisible(False)
+        self.statusBar.addPermanentWidget(self.busy_indicator)
+        self.cancel_task_button = QPushButton("İptal")
+        self.cancel_task_button.setVisible(False)
+        self.cancel_task_button.clicked.connect(self.task_runner.cancel_all)
+        self.statusBar.addPermanentWidget(self.cancel_task_button)
+        self.task_runner.busy_changed.connect(self._on_busy_changed)
+
         self._setup_tabs()
         self.notebook.currentChanged.connect(self._on_tab_change)
         self._apply_role_permissions() # Rol bazlı izinleri uygula
 
         self._setup_settings_menu() # Tema seçimi için ayarlar menüsü
 
+    def _on_busy_changed(self, busy):
+        self.busy_indicator.setVisible(busy)
+        self.cancel_task_button.setVisible(busy)
+
+    def closeEvent(self, event):
+        # Pencere kapanırken çalışan sorguları iptal et ve thread'lerin bitmesini bekle
+        self.task_runner.cancel_all()
+        self.task_runner.wait_for_done(5000)
+        super().closeEvent(event)
+
     def _setup_settings_menu(self):
         # Tema seçimi için bir QComboBox oluştur
         self.theme_selector = QComboBox()
@@ -617,6 +914,9 @@ class KonteynerSorgulamaApp(QMainWindow):
 
         theme_layout = QHBoxLayout()
         theme_layout.addStretch(1) # Sağa hizala
+        diagnostics_button = QPushButton("Sorgu Tanılama")
+        diagnostics_button.clicked.connect(lambda: QueryDiagnosticsDialog(self, self.db).exec_())
+        theme_layout.addWidget(diagnostics_button)
         theme_layout.addWidget(QLabel("Tema Seçimi:"))
         theme_layout.addWidget(self.theme_selector)
         self.main_layout.insertLayout(0, theme_layout) # En üste ekle
@@ -748,8 +1048,8 @@ class KonteynerSorgulamaApp(QMainWindow):
         self.view_logs_button.clicked.connect(self._view_selected_operation_logs)
         crud_hbox.addWidget(self.view_logs_button)
 
-        self.export_button = QPushButton("CSV'ye Aktar")
-        self.export_button.clicked.connect(self._export_current_table_to_csv)
+        self.export_button = QPushButton("Dışa Aktar")
+        self.export_button.clicked.connect(self._export_search_results)
         crud_hbox.addWidget(self.export_button)
 
         self.import_button = QPushButton("CSV'den İçe Aktar")
@@ -762,7 +1062,7 @@ class KonteynerSorgulamaApp(QMainWindow):
 
         # Sonuç Tablosu
         self.query_results_table_view = QTableView()
-        self.query_results_model = PandasModel()
+        self.query_results_model = LazyPandasModel(task_runner=self.task_runner)
         self.query_results_table_view.setModel(self.query_results_model)
         self.query_results_table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.query_results_table_view)
@@ -798,37 +1098,81 @@ class KonteynerSorgulamaApp(QMainWindow):
 
         if not search_criteria:
             QMessageBox.warning(self, "Uyarı", "Lütfen arama için en az bir kriter girin veya tarih aralığını ayarlayın.")
-            self.query_results_model.setDataFrame(pd.DataFrame())
+            self._clear_query_results()
             return
 
-        try:
-            df = self.db.search_port_operations(search_criteria) 
+        def on_loaded(df):
             if df.empty:
                 QMessageBox.information(self, "Sonuç Yok", "Belirtilen kriterlere uygun operasyon kaydı bulunamadı.")
-            self.query_results_model.setDataFrame(df)
-            self.statusBar.showMessage(f"{len(df)} kayıt bulundu.", 3000) # 3 saniye göster
-        except Exception as e:
+            self.statusBar.showMessage(self._loaded_rows_message(len(df)), 3000) # 3 saniye göster
+
+        def on_error(e):
             QMessageBox.critical(self, "Sorgu Hatası", f"Konteyner sorgulanırken bir hata oluştu: {e}")
             self.statusBar.showMessage("Sorgu hatası!", 3000)
 
+        self._load_operations_pages(search_criteria, on_loaded, on_error)
+
+
+    def _load_operations_pages(self, search_criteria, on_loaded, on_error):
+        """
+        Sonuç tablosunu keyset sayfalı kaynağa bağlar. İlk sayfa arka planda çekilir ve
+        on_loaded(df) ana thread'de çağrılır; kalan sayfalar kaydırdıkça yüklenir.
+        Daha sonra başlatılan bir arama varsa bu aramanın sonuçları (ve hataları) yok sayılır.
+        """
+        self._search_generation += 1
+        generation = self._search_generation
+
+        def fetch_page(after_key):
+            return self.db.search_port_operations_page(search_criteria, QUERY_PAGE_SIZE, after_key)
+
+        def on_first_page(first_page):
+            if generation != self._search_generation:
+                return
+            # Dışa aktarma tabloda görünen sonuçların kriterlerini kullanır
+            self._current_search_criteria = dict(search_criteria)
+            self.query_results_model.setPageSource(fetch_page, first_page)
+            on_loaded(self.query_results_model.getDataFrame())
+
+        def on_first_page_error(e):
+            if generation == self._search_generation:
+                on_error(e)
+
+        def on_cancelled():
+            if generation == self._search_generation:
+                self.statusBar.showMessage("Sorgu iptal edildi.", 3000)
+
+        self.statusBar.showMessage("Sorgu çalışıyor...")
+        self.task_runner.run(fetch_page, None, on_success=on_first_page, on_error=on_first_page_error, on_cancelled=on_cancelled)
+
+    def _clear_query_results(self):
+        """Sonuç tablosunu boşaltır; hâlâ çalışan bir aramanın sonuçları artık tabloya yazılmaz."""
+        self._search_generation += 1
+        self._current_search_criteria = None
+        self.query_results_model.setDataFrame(pd.DataFrame())
+
+    def _loaded_rows_message(self, row_count):
+        if self.query_results_model.canFetchMore():
+            return f"İlk {row_count} kayıt gösteriliyor (kaydırdıkça devamı yüklenir)."
+        return f"{row_count} kayıt bulundu."
 
     def _show_all_operations(self):
-        try:
-            df = self.db.get_all_port_operations_data()
+        def on_loaded(df):
             if df.empty:
                 QMessageBox.information(self, "Veri Yok", "Sistemde hiç operasyon kaydı bulunamadı.")
-            self.query_results_model.setDataFrame(df)
-            self.container_id_input.clear() # Inputu temizle
-            self.vessel_name_filter.setCurrentIndex(0) # Filtreleri temizle
-            self.status_filter.setCurrentIndex(0)
-            self.location_filter.setCurrentIndex(0)
-            self.start_date_filter.setDate(QDate(2000, 1, 1)) # Tarih filtrelerini temizle
-            self.end_date_filter.setDate(QDate.currentDate().addYears(1))
-            self.statusBar.showMessage(f"Tüm {len(df)} kayıt gösteriliyor.", 3000)
-        except Exception as e:
+            self.statusBar.showMessage(self._loaded_rows_message(len(df)), 3000)
+
+        def on_error(e):
             QMessageBox.critical(self, "Veritabanı Hatası", f"Tüm operasyonlar çekilirken bir hata oluştu: {e}")
             self.statusBar.showMessage("Veritabanı hatası!", 3000)
 
+        self.container_id_input.clear() # Inputu temizle
+        self.vessel_name_filter.setCurrentIndex(0) # Filtreleri temizle
+        self.status_filter.setCurrentIndex(0)
+        self.location_filter.setCurrentIndex(0)
+        self.start_date_filter.setDate(QDate(2000, 1, 1)) # Tarih filtrelerini temizle
+        self.end_date_filter.setDate(QDate.currentDate().addYears(1))
+        self._load_operations_pages({}, on_loaded, on_error)
+
     def _add_operation(self):
         dialog = OperationFormDialog(self, self.db)
         if dialog.exec_() == QDialog.Accepted:
@@ -868,7 +1212,7 @@ class KonteynerSorgulamaApp(QMainWindow):
             QMessageBox.warning(self, "Hata", "Geçerli bir satır seçilemedi. Lütfen tabloyu yenileyin.")
             return
 
-        current_data = df.iloc[row].to_dict()
+        current_data = frame_row_to_dict(df, row)
         container_id_to_update = current_data.get('container_id')
 
         if not container_id_to_update:
@@ -960,25 +1304,60 @@ class KonteynerSorgulamaApp(QMainWindow):
         self.statusBar.showMessage(f"Konteyner {container_id_to_view_logs} logları görüntülendi.", 3000)
 
 
-    def _export_current_table_to_csv(self):
-        df = self.query_results_model.getDataFrame()
-        if df.empty:
+    def _export_search_results(self):
+        """
+        Tabloda gösterilen aramanın tüm sonuçlarını (yalnızca yüklenen sayfaları değil) seçilen biçimde dışa aktarır.
+        Veri veritabanından COPY ile doğrudan dosyaya akar; aktarma arka planda çalışır ve iptal edilebilir.
+        """
+        if self._current_search_criteria is None or self.query_results_model.getDataFrame().empty:
             QMessageBox.warning(self, "Uyarı", "Dışa aktarılacak veri bulunmamaktadır.")
             return
 
-        file_name, _ = QFileDialog.getSaveFileName(self, "CSV Olarak Kaydet", "konteyner_operasyonlari.csv", "CSV Dosyaları (*.csv);;Tüm Dosyalar (*)")
-        if file_name:
-            try:
-                # Sadece mevcut tabloda gösterilen veriyi dışa aktar
-                df_to_export = self.query_results_model.getDataFrame()
-                df_to_export.to_csv(file_name, index=False, encoding='utf-8-sig')
-                QMessageBox.information(self, "Başarılı", f"Veriler '{file_name}' dosyasına başarıyla aktarıldı.")
-                self.db.add_user_action_log(self.current_username, "Export Data", f"Exported current table data to {file_name}")
-                self.statusBar.showMessage(f"Veriler '{file_name}' dosyasına aktarıldı.", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Hata", f"Veriler dışa aktarılırken bir hata oluştu: {e}")
-                self.db.add_user_action_log(self.current_username, "Export Data Failed", f"Failed to export current table data: {e}")
-                self.statusBar.showMessage("Veri dışa aktarılamadı!", 3000)
+        file_filters = list(EXPORT_FILE_FILTERS) + ["Tüm Dosyalar (*)"]
+        file_name, selected_filter = QFileDialog.getSaveFileName(self, "Dışa Aktar", "konteyner_operasyonlari.csv",
+                                                                 ";;".join(file_filters))
+        if not file_name:
+            return
+        if selected_filter in EXPORT_FILE_FILTERS:
+            export_format, extension = EXPORT_FILE_FILTERS[selected_filter]
+            if not file_name.lower().endswith(extension):
+                file_name += extension
+        else:
+            export_format = export_format_for_path(file_name)
+
+        progress = QProgressDialog("Veriler dışa aktarılıyor...", "İptal", 0, 0, self)
+        progress.setWindowTitle("Dışa Aktarma")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+
+        def update_progress(bytes_written):
+            # Toplam boyut önceden bilinmediği için yalnızca aktarılan veri miktarı gösterilir
+            progress.setLabelText(f"Veriler dışa aktarılıyor... ({bytes_written / (1024 * 1024):.0f} MB)")
+
+        def on_finished(result):
+            progress.close()
+            QMessageBox.information(self, "Başarılı", f"{result['rows']} kayıt '{file_name}' dosyasına başarıyla aktarıldı.")
+            self.db.add_user_action_log(self.current_username, "Export Data",
+                                        f"Exported {result['rows']} port_operations rows ({export_format}) to {file_name}")
+            self.statusBar.showMessage(f"Veriler '{file_name}' dosyasına aktarıldı.", 3000)
+
+        def on_error(e):
+            progress.close()
+            QMessageBox.critical(self, "Hata", f"Veriler dışa aktarılırken bir hata oluştu: {e}")
+            self.db.add_user_action_log(self.current_username, "Export Data Failed", f"Failed to export port_operations data: {e}")
+            self.statusBar.showMessage("Veri dışa aktarılamadı!", 3000)
+
+        def on_cancelled():
+            progress.close()
+            self.db.add_user_action_log(self.current_username, "Export Data Cancelled", f"Cancelled export of port_operations data to {file_name}")
+            self.statusBar.showMessage("Dışa aktarma iptal edildi.", 3000)
+
+        # İptal edilirse COPY sunucu tarafında durdurulur ve yarım kalan dosya silinir
+        task = self.task_runner.run(self.db.export_port_operations, file_name, self._current_search_criteria,
+                                    export_format, with_progress=True, on_success=on_finished, on_error=on_error,
+                                    on_progress=update_progress, on_cancelled=on_cancelled)
+        progress.canceled.connect(lambda: self.task_runner.cancel(task))
 
     def _import_data_from_csv(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "CSV Dosyası Seç", "", "CSV Dosyaları (*.csv);;Tüm Dosyalar (*)")
@@ -989,9 +1368,22 @@ class KonteynerSorgulamaApp(QMainWindow):
             if reply == QMessageBox.No:
                 return
 
-            try:
-                # 'port_operations' tablosuna aktarılacak
-                success, message = self.db.import_data_from_csv('port_operations', file_name)
+            progress = QProgressDialog("CSV dosyası içe aktarılıyor...", "İptal", 0, 100, self)
+            progress.setWindowTitle("İçe Aktarma")
+            progress.setWindowModality(Qt.WindowModal)
+            progress.setMinimumDuration(0)
+            progress.setAutoClose(False)
+            progress.setValue(0)
+
+            def update_progress(rows_done, bytes_read, total_bytes):
+                # Dosyanın okunan kısmına göre ilerlemeyi göster (ana thread'de, arka plan görevinin sinyaliyle çağrılır)
+                if total_bytes:
+                    progress.setValue(min(99, int(bytes_read * 100 / total_bytes)))
+                progress.setLabelText(f"CSV dosyası içe aktarılıyor... ({rows_done} satır işlendi)")
+
+            def on_finished(result):
+                progress.close()
+                success, message = result
                 if success:
                     QMessageBox.information(self, "Başarılı", f"Veriler başarıyla içe aktarıldı.\n{message}")
                     self.db.add_user_action_log(self.current_username, "Import Data", f"Imported port_operations data from {file_name}. {message}")
@@ -1001,11 +1393,24 @@ class KonteynerSorgulamaApp(QMainWindow):
                     QMessageBox.critical(self, "Hata", f"Veriler içe aktarılırken bir hata oluştu: {message}")
                     self.db.add_user_action_log(self.current_username, "Import Data Failed", f"Failed to import port_operations data from {file_name}: {message}")
                     self.statusBar.showMessage("Veri içe aktarılamadı!", 3000)
-            except Exception as e:
+
+            def on_error(e):
+                progress.close()
                 QMessageBox.critical(self, "Hata", f"Veriler içe aktarılırken bir hata oluştu: {e}")
                 self.db.add_user_action_log(self.current_username, "Import Data Failed", f"Failed to import port_operations data: {e}")
                 self.statusBar.showMessage("Veri içe aktarılamadı!", 3000)
 
+            def on_cancelled():
+                progress.close()
+                self.db.add_user_action_log(self.current_username, "Import Data Cancelled", f"Cancelled import of port_operations data from {file_name}")
+                self.statusBar.showMessage("İçe aktarma iptal edildi.", 3000)
+
+            # 'port_operations' tablosuna aktarılacak; iptal edilirse işlem geri alınır
+            task = self.task_runner.run(self.db.import_data_from_csv, 'port_operations', file_name, with_progress=True,
+                                        on_success=on_finished, on_error=on_error, on_progress=update_progress,
+                                        on_cancelled=on_cancelled)
+            progress.canceled.connect(lambda: self.task_runner.cancel(task))
+
 
     def _setup_billing_tab(self):
         layout = QVBoxLayout(self.billing_tab)
@@ -1050,9 +1455,12 @@ class KonteynerSorgulamaApp(QMainWindow):
             return
 
         container_data = container_data_df.iloc[0].to_dict() # İlk satırı al
-        
-        # Fatura hesaplama mantığını ReportGenerator'dan çağır
-        total_cost = self.reporter._calculate_single_container_billing(container_data)
+
+        # Fatura hesaplama mantığını ReportGenerator'dan çağır (kalış süresi ve tarife dahil)
+        billing = self.reporter.calculate_billing_details(container_data_df.iloc[[0]]).iloc[0]
+        total_cost = float(billing['billing_amount'])
+        stay_duration_days = int(billing['stay_duration_days'])
+        daily_rate = billing['daily_rate']
 
         vessel_name = container_data.get('vessel_name')
         arrival_date = container_data.get('arrival_date')
@@ -1065,15 +1473,6 @@ class KonteynerSorgulamaApp(QMainWindow):
         billing_text += f"Mevcut Durum: {container_data.get('container_status', 'Bilinmiyor')}\n"
         billing_text += f"Mevcut Lokasyon: {container_data.get('location_area', 'Bilinmiyor')}\n"
 
-        stay_duration_days = 0
-        if isinstance(arrival_date, datetime) and isinstance(departure_date, datetime) and departure_date >= arrival_date:
-            stay_duration = departure_date - arrival_date
-            stay_duration_days = stay_duration.days
-            if stay_duration_days == 0 and stay_duration.total_seconds() > 0:
-                stay_duration_days = 1
-            elif stay_duration_days == 0 and stay_duration.total_seconds() == 0:
-                stay_duration_days = 0
-
         if arrival_date:
             billing_text += f"Limana Giriş Tarihi: {arrival_date.strftime('%Y-%m-%d %H:%M:%S')}\n"
         else:
@@ -1086,8 +1485,7 @@ class KonteynerSorgulamaApp(QMainWindow):
 
         billing_text += f"Kalış Süresi: {stay_duration_days} gün\n"
         
-        daily_rate = self.db.get_vessel_tariff(vessel_name)
-        if daily_rate is not None:
+        if pd.notna(daily_rate):
             billing_text += f"Günlük Tarife: {float(daily_rate):.2f} $\n"
             billing_text += f"Toplam Fatura: {total_cost:.2f} $"
         else:
@@ -1205,28 +1603,29 @@ class KonteynerSorgulamaApp(QMainWindow):
 
 
     def _setup_reports_tab(self):
-        layout = QVBoxLayout(self.reports_tab)
+        layout = QHBoxLayout(self.reports_tab)
+        buttons_layout = QVBoxLayout()
         reports_group = QGroupBox("Raporlar")
         reports_layout = QVBoxLayout(reports_group)
 
         btn_status_distribution = QPushButton("Konteyner Durum Dağılımı")
-        btn_status_distribution.clicked.connect(self.reporter.generate_status_distribution)
+        btn_status_distribution.clicked.connect(lambda: self._run_report('status_distribution'))
         reports_layout.addWidget(btn_status_distribution)
 
         btn_location_distribution = QPushButton("Konteyner Lokasyon Dağılımı")
-        btn_location_distribution.clicked.connect(self.reporter.generate_location_distribution)
+        btn_location_distribution.clicked.connect(lambda: self._run_report('location_distribution'))
         reports_layout.addWidget(btn_location_distribution)
 
         btn_monthly_operations = QPushButton("Aylık İşlem Sayısı")
-        btn_monthly_operations.clicked.connect(self.reporter.generate_monthly_operations)
+        btn_monthly_operations.clicked.connect(lambda: self._run_report('monthly_operations'))
         reports_layout.addWidget(btn_monthly_operations)
 
         btn_annual_operations = QPushButton("Yıllık İşlem Sayısı")
-        btn_annual_operations.clicked.connect(self.reporter.generate_annual_operations)
+        btn_annual_operations.clicked.connect(lambda: self._run_report('annual_operations'))
         reports_layout.addWidget(btn_annual_operations)
 
         btn_top_ports = QPushButton("En Yoğun Limanlar")
-        btn_top_ports.clicked.connect(self.reporter.generate_top_ports)
+        btn_top_ports.clicked.connect(lambda: self._run_report('top_ports'))
         reports_layout.addWidget(btn_top_ports)
 
         # Genel Faturalandırma Raporları
@@ -1234,19 +1633,19 @@ class KonteynerSorgulamaApp(QMainWindow):
         general_billing_report_layout = QVBoxLayout(general_billing_report_group)
 
         btn_billing_annual_all_data = QPushButton("Tüm Veri - Yıllık Fatura Raporu")
-        btn_billing_annual_all_data.clicked.connect(lambda: self.reporter.generate_billing_report(None, None, 'yearly'))
+        btn_billing_annual_all_data.clicked.connect(lambda: self._run_billing_report(None, None, 'yearly'))
         general_billing_report_layout.addWidget(btn_billing_annual_all_data)
 
         btn_billing_monthly_all_data = QPushButton("Tüm Veri - Aylık Fatura Raporu")
-        btn_billing_monthly_all_data.clicked.connect(lambda: self.reporter.generate_billing_report(None, None, 'monthly'))
+        btn_billing_monthly_all_data.clicked.connect(lambda: self._run_billing_report(None, None, 'monthly'))
         general_billing_report_layout.addWidget(btn_billing_monthly_all_data)
 
         btn_billing_weekly_all_data = QPushButton("Tüm Veri - Haftalık Fatura Raporu")
-        btn_billing_weekly_all_data.clicked.connect(lambda: self.reporter.generate_billing_report(None, None, 'weekly'))
+        btn_billing_weekly_all_data.clicked.connect(lambda: self._run_billing_report(None, None, 'weekly'))
         general_billing_report_layout.addWidget(btn_billing_weekly_all_data)
 
         btn_billing_daily_all_data = QPushButton("Tüm Veri - Günlük Fatura Raporu")
-        btn_billing_daily_all_data.clicked.connect(lambda: self.reporter.generate_billing_report(None, None, 'daily'))
+        btn_billing_daily_all_data.clicked.connect(lambda: self._run_billing_report(None, None, 'daily'))
         general_billing_report_layout.addWidget(btn_billing_daily_all_data)
 
         btn_billing_custom_range = QPushButton("Özel Tarih Aralığı Fatura Raporu")
@@ -1267,22 +1666,123 @@ class KonteynerSorgulamaApp(QMainWindow):
         reports_layout.addWidget(vessel_billing_report_group)
 
 
-        layout.addWidget(reports_group)
-        layout.addStretch(1) # Boş alanı doldurmak için
+        buttons_layout.addWidget(reports_group)
+        buttons_layout.addStretch(1) # Boş alanı doldurmak için
+        layout.addLayout(buttons_layout)
+
+        # Grafik alanı: her önbellekteki rapor kendi tuvaline sahiptir, raporlar arası geçiş yalnızca sayfa değiştirir
+        self.report_chart_stack = QStackedWidget()
+        self.report_chart_placeholder = QLabel("Görüntülemek için soldan bir rapor seçin.")
+        self.report_chart_placeholder.setAlignment(Qt.AlignCenter)
+        self.report_chart_stack.addWidget(self.report_chart_placeholder)
+        layout.addWidget(self.report_chart_stack, 1)
+
+    REPORT_CACHE_SIZE = 12 # Bellekte tutulan en fazla rapor grafiği
+
+    def _load_report_if_changed(self, report_name, args, cached_versions):
+        """
+        Arka planda çalışır: veri sürümleri önbellektekiyle aynıysa veriyi yeniden okumaz ve (sürümler, None) döndürür.
+        Sürümler okunamazsa (None) önbelleğe güvenilmez ve veri her seferinde yeniden yüklenir.
+        """
+        versions = self.db.get_data_versions()
+        if versions is not None and versions == cached_versions:
+            return versions, None
+        if self.db.snapshot is not None:
+            self.db.snapshot.refresh() # Yalnızca yeni/değişen satırlar çekilir
+        load_data = getattr(self.reporter, REPORT_TYPES[report_name][0])
+        return versions, load_data(*args)
+
+    def _show_report_canvas(self, key):
+        entry = self._report_cache[key]
+        self._report_cache.move_to_end(key)
+        self.report_chart_stack.setCurrentWidget(entry['canvas'])
+
+    def _store_report_chart(self, key, report_name, args, versions, data):
+        """Veriyi önbellekteki grafiğe yerinde uygular; kategoriler değiştiyse veya grafik yoksa yeniden çizer."""
+        entry = self._report_cache.get(key)
+        if entry is not None and update_report_figure(entry['canvas'].figure, report_name, entry['data'], data):
+            entry['versions'], entry['data'] = versions, data
+            return
+
+        render = getattr(self.reporter, REPORT_TYPES[report_name][1])
+        canvas = FigureCanvasQTAgg(render(*args, data=data))
+        self.report_chart_stack.addWidget(canvas)
+        if entry is not None:
+            self._discard_report_canvas(entry['canvas'])
+        self._report_cache[key] = {'versions': versions, 'data': data, 'canvas': canvas}
+        while len(self._report_cache) > self.REPORT_CACHE_SIZE:
+            _, oldest = self._report_cache.popitem(last=False)
+            self._discard_report_canvas(oldest['canvas'])
+
+    def _discard_report_canvas(self, canvas):
+        self.report_chart_stack.removeWidget(canvas)
+        canvas.deleteLater()
+
+    def _run_report(self, report_name, *args, on_rendered=None, on_failed=None):
+        """
+        Raporu Raporlar sekmesindeki grafik alanında gösterir. (rapor, parametreler) için önbellekte grafik varsa
+        hemen gösterilir; ardından veri sürümü arka planda kontrol edilir ve yalnızca veri değiştiyse yeniden yüklenip
+        grafik yerinde güncellenir. Veri yoksa (ReportDataError) kullanıcı bilgilendirilir; diğer hatalar on_failed'e iletilir.
+        """
+        key = (report_name, args)
+        self._current_report_key = key
+        cached = self._report_cache.get(key)
+        if cached is not None:
+            self._show_report_canvas(key)
+
+        def on_success(result):
+            versions, data = result
+            if data is not None:
+                self._store_report_chart(key, report_name, args, versions, data)
+            elif key not in self._report_cache:
+                # Veri değişmedi ama grafik beklerken önbellekten (LRU) atıldı: yalnızca hâlâ seçiliyse baştan yüklenir
+                if self._current_report_key == key:
+                    self._run_report(report_name, *args, on_rendered=on_rendered, on_failed=on_failed)
+                return
+            # Bu arada başka bir rapor seçildiyse onun görünümü bozulmaz
+            if self._current_report_key == key:
+                self._show_report_canvas(key)
+            self.statusBar.showMessage("Rapor güncel.", 2000)
+            if on_rendered:
+                on_rendered()
+
+        def on_error(e):
+            if isinstance(e, ReportDataError):
+                QMessageBox.information(self, "Rapor Hatası", str(e))
+                return
+            QMessageBox.critical(self, "Rapor Hatası", f"Rapor oluşturulurken bir hata oluştu: {e}")
+            self.statusBar.showMessage("Rapor oluşturulamadı!", 3000)
+            if on_failed:
+                on_failed(e)
+
+        self.statusBar.showMessage("Rapor verisi kontrol ediliyor..." if cached is not None else "Rapor verisi hazırlanıyor...")
+        self.task_runner.run(self._load_report_if_changed, report_name, args, cached['versions'] if cached else None,
+                             on_success=on_success, on_error=on_error,
+                             on_cancelled=lambda: self.statusBar.showMessage("Rapor iptal edildi.", 3000))
+
+    def _refresh_current_report(self):
+        """Görüntülenen rapor grafiğini (veri değiştiyse) günceller."""
+        if self._current_report_key is not None and self._current_report_key in self._report_cache:
+            report_name, args = self._current_report_key
+            self._run_report(report_name, *args)
+
+    def _run_billing_report(self, start_date, end_date, period, on_rendered=None, on_failed=None):
+        self._run_report('billing', start_date, end_date, period, on_rendered=on_rendered, on_failed=on_failed)
 
     def _open_billing_report_dialog(self):
         """Genel faturalandırma raporu için tarih aralığı ve periyot seçimi diyalogunu açar."""
         dialog = BillingReportDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             start_date, end_date, period = dialog.get_report_parameters()
-            try:
-                self.reporter.generate_billing_report(start_date, end_date, period)
+
+            def on_rendered():
                 self.db.add_user_action_log(self.current_username, "Generate Custom Range Billing Report", f"Generated custom billing report for {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')} ({period})")
                 self.statusBar.showMessage(f"Özel aralık fatura raporu oluşturuldu.", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Rapor Hatası", f"Faturalandırma raporu oluşturulurken bir hata oluştu: {e}")
+
+            def on_failed(e):
                 self.db.add_user_action_log(self.current_username, "Generate Custom Range Billing Report Failed", f"Failed to generate custom billing report: {e}")
-                self.statusBar.showMessage("Rapor oluşturulamadı!", 3000)
+
+            self._run_billing_report(start_date, end_date, period, on_rendered=on_rendered, on_failed=on_failed)
 
     def _open_vessel_billing_report_dialog(self):
         """Gemiye özel faturalandırma raporu için gemi, tarih aralığı ve periyot seçimi diyalogunu açar."""
@@ -1292,14 +1792,15 @@ class KonteynerSorgulamaApp(QMainWindow):
             if not vessel_name:
                 QMessageBox.warning(self, "Uyarı", "Lütfen rapor oluşturmak için bir gemi adı seçin veya girin.")
                 return
-            try:
-                self.reporter.generate_vessel_specific_billing_report(vessel_name, start_date, end_date, period)
+
+            def on_rendered():
                 self.db.add_user_action_log(self.current_username, "Generate Vessel Billing Report", f"Generated vessel billing report for {vessel_name} from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')} ({period})")
                 self.statusBar.showMessage(f"Gemiye özel fatura raporu oluşturuldu: {vessel_name}", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Rapor Hatası", f"Gemiye özel faturalandırma raporu oluşturulurken bir hata oluştu: {e}")
+
+            def on_failed(e):
                 self.db.add_user_action_log(self.current_username, "Generate Vessel Billing Report Failed", f"Failed to generate vessel billing report for {vessel_name}: {e}")
-                self.statusBar.showMessage("Gemiye özel rapor oluşturulamadı!", 3000)
+
+            self._run_report('vessel_billing', vessel_name, start_date, end_date, period, on_rendered=on_rendered, on_failed=on_failed)
 
 
     def _setup_user_logs_tab(self):
@@ -1307,27 +1808,116 @@ class KonteynerSorgulamaApp(QMainWindow):
         user_logs_group = QGroupBox("Kullanıcı Eylem Logları")
         user_logs_layout = QVBoxLayout(user_logs_group)
 
+        # Sunucu tarafında uygulanan filtreler
+        filter_grid = QGridLayout()
+        filter_grid.addWidget(QLabel("Kullanıcı:"), 0, 0)
+        self.user_logs_username_filter = QComboBox()
+        self.user_logs_username_filter.setEditable(True)
+        filter_grid.addWidget(self.user_logs_username_filter, 0, 1)
+
+        filter_grid.addWidget(QLabel("Eylem Tipi:"), 0, 2)
+        self.user_logs_action_filter = QLineEdit()
+        self.user_logs_action_filter.setPlaceholderText("örn: Login, Import")
+        self.user_logs_action_filter.returnPressed.connect(self._display_user_action_logs)
+        filter_grid.addWidget(self.user_logs_action_filter, 0, 3)
+
+        filter_grid.addWidget(QLabel("Açıklamada Ara:"), 1, 0)
+        self.user_logs_text_filter = QLineEdit()
+        self.user_logs_text_filter.returnPressed.connect(self._display_user_action_logs)
+        filter_grid.addWidget(self.user_logs_text_filter, 1, 1)
+
+        filter_grid.addWidget(QLabel("Tarih Aralığı:"), 1, 2)
+        date_hbox = QHBoxLayout()
+        self.user_logs_start_date = QDateEdit(QDate.currentDate().addDays(-30), calendarPopup=True)
+        self.user_logs_start_date.setDisplayFormat("yyyy-MM-dd")
+        date_hbox.addWidget(self.user_logs_start_date)
+        self.user_logs_end_date = QDateEdit(QDate.currentDate(), calendarPopup=True)
+        self.user_logs_end_date.setDisplayFormat("yyyy-MM-dd")
+        date_hbox.addWidget(self.user_logs_end_date)
+        filter_grid.addLayout(date_hbox, 1, 3)
+        user_logs_layout.addLayout(filter_grid)
+
         self.user_logs_table_view = QTableView()
-        self.user_logs_model = PandasModel()
+        self.user_logs_model = LazyPandasModel(task_runner=self.task_runner)
         self.user_logs_table_view.setModel(self.user_logs_model)
         self.user_logs_table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         user_logs_layout.addWidget(self.user_logs_table_view)
 
-        refresh_button = QPushButton("Logları Yenile")
+        refresh_button = QPushButton("Filtrele/Yenile")
         refresh_button.clicked.connect(self._display_user_action_logs)
         user_logs_layout.addWidget(refresh_button)
 
         layout.addWidget(user_logs_group)
-        layout.addStretch(1)
+        self._user_logs_loaded = False # Sekme ilk açıldığında bir kez yüklenir; sonrası yalnızca Filtrele/Yenile ile
+        self._user_logs_generation = 0 # Her log sorgusunda artar; geç gelen eski filtrelerin sonuçları bununla ayırt edilir
+
+    def _user_action_log_filters(self):
+        """Log sekmesindeki filtre alanlarından search_user_action_logs_page filtrelerini oluşturur."""
+        start_date = self.user_logs_start_date.date().toPyDate()
+        end_date = self.user_logs_end_date.date().toPyDate()
+        return {
+            'username': self.user_logs_username_filter.currentText().strip(),
+            'action_type': self.user_logs_action_filter.text().strip(),
+            'text': self.user_logs_text_filter.text().strip(),
+            'start_time': datetime.combine(start_date, datetime.min.time()),
+            'end_time': datetime.combine(end_date + timedelta(days=1), datetime.min.time()) # Bitiş günü dahil
+        }
+
+    def _refresh_user_log_username_filter(self):
+        def on_users(users_df):
+            # Seçim, liste yüklenirken yazılmış olabileceği için sorgu bittiğinde okunur
+            current = self.user_logs_username_filter.currentText()
+            self.user_logs_username_filter.clear()
+            self.user_logs_username_filter.addItems([""] + (users_df['username'].tolist() if not users_df.empty else []))
+            self.user_logs_username_filter.setCurrentText(current)
+
+        # Kullanıcı listesi yüklenemezse filtre olduğu gibi kalır; kullanıcı adı elle de yazılabilir
+        self.task_runner.run(self.db.get_all_users, on_success=on_users,
+                             on_error=lambda e: print(f"Kullanıcı listesi yüklenemedi: {e}"))
 
     def _display_user_action_logs(self):
-        logs_df = self.db.get_all_user_action_logs()
-        if 'action_time' in logs_df.columns:
-            logs_df['action_time'] = pd.to_datetime(logs_df['action_time'], errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
-        self.user_logs_model.setDataFrame(logs_df)
-        if logs_df.empty:
-            QMessageBox.information(self, "Bilgi", "Henüz kullanıcı eylem logu bulunmamaktadır.")
-        self.statusBar.showMessage(f"Kullanıcı logları yüklendi. Toplam {len(logs_df)} kayıt.", 3000)
+        """
+        Log tablosunu filtrelere göre yükler; ilk sayfa arka planda çekilir, kalanlar kaydırdıkça gelir.
+        Daha sonra başlatılan bir sorgu varsa bu sorgunun sonuçları (ve hataları) yok sayılır.
+        """
+        self._user_logs_generation += 1
+        generation = self._user_logs_generation
+        filters = self._user_action_log_filters()
+
+        def fetch_page(after_key):
+            return self.db.search_user_action_logs_page(filters, QUERY_PAGE_SIZE, after_key)
+
+        def fetch_first_page():
+            # Kuyrukta bekleyen (henüz yazılmamış) eylemler de listede görünsün
+            self.db.flush_user_action_logs()
+            return fetch_page(None)
+
+        def on_first_page(first_page):
+            if generation != self._user_logs_generation:
+                return
+            self.user_logs_model.setPageSource(fetch_page, first_page)
+            self._user_logs_loaded = True
+            row_count = self.user_logs_model.rowCount()
+            if row_count == 0:
+                self.statusBar.showMessage("Filtrelere uygun kullanıcı eylem logu bulunamadı.", 3000)
+            elif self.user_logs_model.canFetchMore():
+                self.statusBar.showMessage(f"Son {row_count} log gösteriliyor (kaydırdıkça devamı yüklenir).", 3000)
+            else:
+                self.statusBar.showMessage(f"Kullanıcı logları yüklendi. Toplam {row_count} kayıt.", 3000)
+
+        def on_error(e):
+            if generation != self._user_logs_generation:
+                return
+            QMessageBox.critical(self, "Veritabanı Hatası", f"Kullanıcı logları çekilirken bir hata oluştu: {e}")
+            self.statusBar.showMessage("Veritabanı hatası!", 3000)
+
+        def on_cancelled():
+            if generation == self._user_logs_generation:
+                self.statusBar.showMessage("Sorgu iptal edildi.", 3000)
+
+        self._refresh_user_log_username_filter()
+        self.statusBar.showMessage("Kullanıcı logları yükleniyor...")
+        self.task_runner.run(fetch_first_page, on_success=on_first_page, on_error=on_error, on_cancelled=on_cancelled)
 
     def _setup_user_management_tab(self):
         """Kullanıcı yönetimi sekmesini ayarlar."""
@@ -1339,7 +1929,7 @@ class KonteynerSorgulamaApp(QMainWindow):
     def _on_tab_change(self, index):
         tab_name = self.notebook.tabText(index)
         if tab_name == 'Konteyner Sorgula':
-            self.query_results_model.setDataFrame(pd.DataFrame()) # Tabloyu boşalt
+            self._clear_query_results() # Tabloyu boşalt
             self.container_id_input.clear() # Arama inputunu temizle
             self.vessel_name_filter.setCurrentIndex(0) # Filtreleri temizle
             self.status_filter.setCurrentIndex(0)
@@ -1347,7 +1937,12 @@ class KonteynerSorgulamaApp(QMainWindow):
             self.start_date_filter.setDate(QDate(2000, 1, 1)) # Tarih filtrelerini temizle
             self.end_date_filter.setDate(QDate.currentDate().addYears(1))
         elif tab_name == 'Kullanıcı Logları':
-            self._display_user_action_logs() # Kullanıcı logları sekmesine geçildiğinde logları yükle
+            # Loglar yalnızca ilk açılışta yüklenir; sonraki geçişlerde tablo ve kaydırma konumu korunur
+            if not self._user_logs_loaded:
+                self._display_user_action_logs()
+        elif tab_name == 'Raporlar':
+            # Sekmeye dönüldüğünde görüntülenen grafik yalnızca veri sürümü değiştiyse yeniden yüklenir
+            self._refresh_current_report()
         elif tab_name == 'Kullanıcı Yönetimi':
             # Kullanıcı Yönetimi sekmesine geçildiğinde kullanıcı listesini yenile
             # Bu sekme artık sadece adminler için oluşturulduğu için ekstra yetki kontrolüne gerek yok.
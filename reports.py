@@ -1,19 +1,98 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from datetime import datetime, timedelta
-from tkinter import messagebox # messagebox'u buraya da ekledik
 
 # matplotlib'in Türkçe karakterleri doğru gösterebilmesi için ayarlar
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
-from db_operations import DBManager
+from db_operations import DBManager, concat_port_operations_frames
+
+# pandas 2.2 ile ay/yıl sonu frekansları 'ME'/'YE' oldu; eski kısaltmalar pandas 3'te kaldırıldı
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+_MONTH_END_FREQ, _YEAR_END_FREQ = ('ME', 'YE') if _PANDAS_VERSION >= (2, 2) else ('M', 'Y')
+
+# Fatura raporu periyotları: periyot -> (pandas frekansı, başlık, x ekseni etiketi, tarih formatı)
+BILLING_PERIODS = {
+    'daily': ('D', 'Günlük', 'Tarih', '%Y-%m-%d'),
+    'weekly': ('W', 'Haftalık', 'Yıl-Hafta', '%Y-%W'),
+    'monthly': (_MONTH_END_FREQ, 'Aylık', 'Ay', '%Y-%m'),
+    'yearly': (_YEAR_END_FREQ, 'Yıllık', 'Yıl', '%Y'),
+}
+
+
+# Toplu/dosyaya çizimde kullanılabilecek raporlar: ad -> (veri adımı, çizim adımı, parametreler çizime de verilir mi)
+REPORT_TYPES = {
+    'status_distribution': ('status_distribution_data', 'generate_status_distribution', False),
+    'location_distribution': ('location_distribution_data', 'generate_location_distribution', False),
+    'monthly_operations': ('monthly_operations_data', 'generate_monthly_operations', False),
+    'annual_operations': ('annual_operations_data', 'generate_annual_operations', False),
+    'top_ports': ('top_ports_data', 'generate_top_ports', False),
+    'vessel_operation_counts': ('vessel_operation_counts_data', 'generate_vessel_operation_counts', False),
+    'billing': ('billing_report_data', 'generate_billing_report', True),
+    'vessel_billing': ('vessel_specific_billing_report_data', 'generate_vessel_specific_billing_report', True),
+}
+OUTPUT_FORMATS = ('png', 'svg', 'pdf')
+# Grafik türleri (yerinde güncelleme için): dikey çubuk, yatay çubuk veya çizgi
+_BAR_REPORTS = {'status_distribution', 'location_distribution', 'vessel_operation_counts'}
+_HORIZONTAL_BAR_REPORTS = {'top_ports'}
+
+
+class ReportDataError(Exception):
+    """Rapor için gösterilecek veri olmadığında (veya parametreler geçersiz olduğunda) veri adımlarının fırlattığı hata."""
+
+
+def _to_datetime64(values):
+    """Tarih sütununu timezone-naive numpy datetime64[ns] dizisine çevirir (hatalı değerler NaT olur)."""
+    series = pd.to_datetime(pd.Series(values), errors='coerce', utc=True)
+    return series.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+
+
+def calculate_stay_days(arrival_dates, departure_dates):
+    """
+    Varış ve çıkış tarihleri arasındaki kalış sürelerini (gün) tüm sütun üzerinde hesaplar.
+    Tam günler sayılır; aynı gün içinde saat farkı varsa 1 gün sayılır.
+    Tarihlerden biri eksikse veya çıkış varıştan önceyse 0 döner.
+    """
+    arrival = _to_datetime64(arrival_dates)
+    departure = _to_datetime64(departure_dates)
+    stay = departure - arrival
+
+    valid = ~np.isnat(stay)
+    valid[valid] = stay[valid] >= np.timedelta64(0, 'ns')
+
+    days = np.zeros(len(stay), dtype=np.int64)
+    days[valid] = stay[valid] // np.timedelta64(1, 'D')
+    # Aynı gün içinde ama saat farkı varsa 1 gün say
+    partial_day = valid.copy()
+    partial_day[valid] = (days[valid] == 0) & (stay[valid] > np.timedelta64(0, 'ns'))
+    days[partial_day] = 1
+    return days
+
 
 class ReportGenerator:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, aggregate_in_db=True, interactive=True, notify=None):
         self.db = db_manager
+        # True ise sayım raporları GROUP BY ile veritabanında hesaplanır; False ise veriler pandas ile sayılır
+        self.aggregate_in_db = aggregate_in_db
+        # interactive=False ise grafikler pyplot'a kaydedilmeyen Figure nesneleri olarak oluşturulur ve gösterilmez
+        # (sunucuda/arka planda dosyaya çizim için); True ise plt.show() ile pencere açılır
+        self.interactive = interactive
+        # Veri olmadığında kullanıcıyı bilgilendiren geri çağırma: notify(başlık, mesaj). Verilmezse konsola yazılır.
+        self.notify = notify
+        self._data_cache = None # shared_data() bloğu içinde port_operations verisi sütun kümesi başına bir kez yüklenir
         plt.style.use('seaborn-v0_8-darkgrid') # Modern bir tema
 
         # Türkçe ay isimleri
@@ -23,139 +102,287 @@ class ReportGenerator:
             9: 'Eylül', 10: 'Ekim', 11: 'Kasım', 12: 'Aralık'
         }
 
-    def _get_all_port_operations_data(self):
-        """Tüm raporların ana veri kaynağı. port_operations tablosundan veri çeker."""
-        df = self.db.get_all_port_operations_data()
-        
-        # timestamp, arrival_date ve departure_date sütunlarını datetime'a çevir
-        # ve zaman dilimi bilgisi varsa kaldırarak timezone-naive yap
-        for col in ['timestamp', 'arrival_date', 'departure_date']:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                # Eğer sütun zaman dilimi bilgisi içeriyorsa, onu kaldır
-                if df[col].dt.tz is not None:
-                    df[col] = df[col].dt.tz_localize(None)
+    @contextmanager
+    def shared_data(self):
+        """Blok içinde aynı sütunları isteyen raporlar port_operations verisini tek bir yüklemeden paylaşır."""
+        self._data_cache = {}
+        try:
+            yield self
+        finally:
+            self._data_cache = None
+
+    def _get_all_port_operations_data(self, columns=None):
+        """
+        Tüm raporların ana veri kaynağı. port_operations tablosundan yalnızca istenen sütunları
+        sunucu tarafı cursor ile parça parça çeker. Tarih sütunları (UTC) timezone-naive olarak döner.
+        """
+        cache_key = tuple(columns) if columns is not None else None
+        if self._data_cache is not None and cache_key in self._data_cache:
+            return self._data_cache[cache_key]
+        df = self._load_port_operations_data(columns)
+        if self._data_cache is not None:
+            self._data_cache[cache_key] = df
         return df
 
-    def _calculate_single_container_billing(self, container_data):
+    def _load_port_operations_data(self, columns):
+        chunks = []
+        for chunk in self.db.iter_port_operations_data(columns=columns):
+            # Zaman dilimi bilgisini her parçada kaldır; tablo bellekte ikinci kez kopyalanmaz
+            for col in ['timestamp', 'arrival_date', 'departure_date']:
+                if col in chunk.columns:
+                    chunk[col] = chunk[col].dt.tz_localize(None)
+            chunks.append(chunk)
+
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        return concat_port_operations_frames(chunks)
+
+    def calculate_billing_details(self, df, tariffs=None):
         """
-        Tek bir konteynerin kalış süresine ve gemi tarifesine göre fatura tutarını hesaplar.
+        Konteyner bazında kalış süresi, günlük tarife ve fatura tutarını vektörel olarak hesaplar.
+        Tarifeler DBManager'ın tarife önbelleğinden alınır ve gemi adına göre (büyük/küçük harf duyarsız) tek bir merge ile eşleştirilir.
+        df.index ile hizalı 'stay_duration_days', 'daily_rate' ve 'billing_amount' sütunlarını döndürür.
         """
-        vessel_name = container_data.get('vessel_name')
-        arrival_date = container_data.get('arrival_date')
-        departure_date = container_data.get('departure_date')
-        
-        total_cost = 0.0
-        stay_duration_days = 0
-
-        # arrival_date ve departure_date'in datetime objeleri olduğundan emin ol
-        # (Pandas Timestamp ise Python datetime'a çevir)
-        if isinstance(arrival_date, pd.Timestamp):
-            arrival_date = arrival_date.to_pydatetime()
-        if isinstance(departure_date, pd.Timestamp):
-            departure_date = departure_date.to_pydatetime()
-
-        if isinstance(arrival_date, datetime) and isinstance(departure_date, datetime):
-            if departure_date >= arrival_date:
-                stay_duration = departure_date - arrival_date
-                stay_duration_days = stay_duration.days
-                if stay_duration_days == 0 and stay_duration.total_seconds() > 0: # Aynı gün içinde ama saat farkı varsa 1 gün say
-                    stay_duration_days = 1
-                elif stay_duration_days == 0 and stay_duration.total_seconds() == 0: # Tamamen aynı zaman ise 0 gün say
-                    stay_duration_days = 0
-                
-                daily_rate = self.db.get_vessel_tariff(vessel_name)
-                if daily_rate is not None:
-                    total_cost = stay_duration_days * float(daily_rate)
-        return total_cost
-
-
-    def generate_status_distribution(self):
-        """Konteyner durum dağılımını gösteren bir çubuk grafik oluşturur."""
-        df = self._get_all_port_operations_data()
+        if tariffs is None:
+            tariffs = self.db.get_cached_vessel_tariffs()
+
+        stay_days = calculate_stay_days(df['arrival_date'], df['departure_date'])
+
+        vessel_keys = pd.DataFrame({'vessel_key': df['vessel_name'].astype('string').str.lower().to_numpy()})
+        if tariffs.empty:
+            daily_rates = np.full(len(df), np.nan)
+        else:
+            tariff_keys = pd.DataFrame({
+                'vessel_key': tariffs['vessel_name'].astype('string').str.lower(),
+                'daily_rate': tariffs['daily_rate'].astype(float)
+            }).drop_duplicates('vessel_key')
+            daily_rates = vessel_keys.merge(tariff_keys, on='vessel_key', how='left')['daily_rate'].to_numpy(dtype=float)
+
+        # Tarifesi olmayan gemiler için fatura 0 olur
+        billing_amounts = np.where(np.isnan(daily_rates), 0.0, stay_days * daily_rates)
+        return pd.DataFrame({
+            'stay_duration_days': stay_days,
+            'daily_rate': daily_rates,
+            'billing_amount': billing_amounts
+        }, index=df.index)
+
+    def calculate_billing(self, df, tariffs=None):
+        """Konteyner bazında fatura tutarlarını df.index ile hizalı bir seri olarak döndürür."""
+        return self.calculate_billing_details(df, tariffs)['billing_amount']
+
+
+    def _value_counts_data(self, column, top_n=None):
+        """Bir sütunun değer sayılarını (NULL hariç, en çoktan en aza) döndürür."""
+        if self.aggregate_in_db:
+            return self.db.count_port_operations_by(column, limit=top_n)
+
+        df = self._get_all_port_operations_data(columns=[column])
+        if df.empty:
+            return pd.Series(dtype='int64')
+        counts = df[column].value_counts()
+        if isinstance(counts.index, pd.CategoricalIndex):
+            # category sütunlarında veride geçmeyen kategoriler de 0 sayımla gelir; indeks düz değerlere çevrilir
+            counts = counts[counts > 0]
+            counts.index = counts.index.astype(counts.index.categories.dtype)
+        return counts.head(top_n) if top_n is not None else counts
+
+    def _operations_by_period_data(self, period):
+        """İşlem sayılarını aylık ('M') veya yıllık ('Y') dönemlere göre, dönem sırasıyla döndürür."""
+        if self.aggregate_in_db:
+            counts = self.db.count_port_operations_by_period('month' if period == 'M' else 'year')
+            counts.index = counts.index.to_period(period)
+            return counts
+
+        df = self._get_all_port_operations_data(columns=['timestamp'])
         if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Konteyner durum dağılımı raporu için veri bulunamadı.")
+            return pd.Series(dtype='int64')
+        return df['timestamp'].dropna().dt.to_period(period).value_counts().sort_index()
+
+    def _load_report_data(self, loader, *args):
+        """Rapor verisini yükler; veri yoksa kullanıcıyı bilgilendirip None döndürür."""
+        try:
+            return loader(*args)
+        except ReportDataError as e:
+            if self.notify:
+                self.notify("Rapor Hatası", str(e))
+            else:
+                print(f"Rapor Hatası: {e}")
             return None
 
-        status_counts = df['container_status'].value_counts()
+    def _new_figure(self, figsize):
+        """Yeni bir grafik ve ekseni oluşturur. Etkileşimsiz modda Figure pyplot'tan bağımsızdır (GUI backend'i gerekmez)."""
+        if self.interactive:
+            return plt.subplots(figsize=figsize)
+        fig = Figure(figsize=figsize)
+        return fig, fig.subplots()
+
+    def _finish_figure(self, fig, ax):
+        ax.grid(True)
+        fig.tight_layout()
+        if self.interactive:
+            plt.show()
+        return fig
+
+    # --- Veri adımları: veritabanı/pandas işi yapar, grafik oluşturmaz (arka plan thread'inde çalışabilir) ---
 
+    def status_distribution_data(self):
+        status_counts = self._value_counts_data('container_status')
         if status_counts.empty:
-            messagebox.showinfo("Rapor Hatası", "Konteyner durum dağılımı raporu için yeterli veri yok.")
+            raise ReportDataError("Konteyner durum dağılımı raporu için yeterli veri yok.")
+        return status_counts
+
+    def location_distribution_data(self, top_n=10):
+        top_locations = self._value_counts_data('location_area', top_n)
+        if top_locations.empty:
+            raise ReportDataError("Konteyner lokasyon dağılımı raporu için yeterli veri yok.")
+        return top_locations
+
+    def monthly_operations_data(self):
+        # Yıl ve ay bazında işlem sayıları (geçerli zaman damgası olan kayıtlar)
+        monthly_counts = self._operations_by_period_data('M')
+        if monthly_counts.empty:
+            raise ReportDataError("Aylık işlem sayısı raporu için yeterli veri yok.")
+        return monthly_counts
+
+    def annual_operations_data(self):
+        annual_counts = self._operations_by_period_data('Y')
+        if annual_counts.empty:
+            raise ReportDataError("Yıllık işlem sayısı raporu için yeterli veri yok.")
+        return annual_counts
+
+    def top_ports_data(self, top_n=10):
+        """Varış ve kalkış limanlarını birlikte sayıp en yoğun top_n limanı döndürür."""
+        if self.aggregate_in_db:
+            port_counts = self.db.count_top_ports(limit=top_n)
+        else:
+            df = self._get_all_port_operations_data(columns=['arrival_port', 'departure_port'])
+            # NaN değerleri düşürerek sadece geçerli liman isimlerini al
+            all_ports = pd.concat([df['arrival_port'].dropna(), df['departure_port'].dropna()]) if not df.empty else pd.Series(dtype=object)
+            port_counts = all_ports.value_counts().head(top_n)
+        if port_counts.empty:
+            raise ReportDataError("En yoğun limanlar raporu için yeterli veri yok.")
+        return port_counts
+
+    def vessel_operation_counts_data(self, top_n=10):
+        vessel_counts = self._value_counts_data('vessel_name', top_n)
+        if vessel_counts.empty:
+            raise ReportDataError("Gemiye göre konteyner sayısı raporu için yeterli veri yok.")
+        return vessel_counts
+
+    def _billing_by_period(self, df, start_date, end_date, period):
+        """Tarih aralığındaki kayıtların fatura tutarlarını arrival_date'e göre periyot bazında toplar."""
+        if period not in BILLING_PERIODS:
+            raise ReportDataError("Geçersiz periyot seçimi. Lütfen 'daily', 'weekly', 'monthly' veya 'yearly' seçin.")
+
+        # start_date ve end_date'in timezone-naive olduğundan emin ol
+        if start_date.tzinfo is not None:
+            start_date = start_date.replace(tzinfo=None)
+        if end_date.tzinfo is not None:
+            end_date = end_date.replace(tzinfo=None)
+
+        # arrival_date'i baz alarak tarih aralığına göre filtrele
+        df_filtered = df[(df['arrival_date'] >= start_date) & (df['arrival_date'] <= end_date)].copy()
+        if df_filtered.empty:
+            raise ReportDataError("Belirtilen tarih aralığında faturalandırma verisi bulunamadı.")
+
+        # Fatura tutarlarını hesapla
+        df_filtered['billing_amount'] = self.calculate_billing(df_filtered)
+        if df_filtered['billing_amount'].sum() == 0:
+            raise ReportDataError("Belirtilen tarih aralığında faturalandırılabilecek işlem bulunamadı veya tarifeler eksik.")
+
+        # arrival_date'e göre grupla, boş dönemleri 0 ile doldur
+        freq = BILLING_PERIODS[period][0]
+        billing_by_period = df_filtered.groupby(pd.Grouper(key='arrival_date', freq=freq))['billing_amount'].sum()
+        billing_by_period = billing_by_period.asfreq(freq, fill_value=0)
+        if billing_by_period.empty:
+            raise ReportDataError("Belirtilen periyot için faturalandırma verisi yok.")
+
+        return {
+            'billing_by_period': billing_by_period,
+            'start_date': start_date,
+            'end_date': end_date,
+            'period': period
+        }
+
+    def billing_report_data(self, start_date=None, end_date=None, period='monthly'):
+        """
+        Genel faturalandırma raporunun verisi. start_date ve end_date None ise,
+        tüm veri setindeki min/max varış tarihlerini kullanır.
+        """
+        df = self._get_all_port_operations_data(columns=['vessel_name', 'arrival_date', 'departure_date'])
+        if df.empty:
+            raise ReportDataError("Faturalandırma raporu için veri bulunamadı.")
+
+        # Eğer tarih aralığı belirtilmemişse, tüm veri setindeki min/max tarihleri bul
+        if start_date is None or end_date is None:
+            min_date = df['arrival_date'].min()
+            max_date = df['arrival_date'].max()
+            if pd.isna(min_date) or pd.isna(max_date):
+                raise ReportDataError("Faturalandırma raporu için geçerli 'Limana Giriş Tarihi' verisi bulunamadı.")
+            start_date = min_date
+            end_date = max_date
+
+        return self._billing_by_period(df, start_date, end_date, period)
+
+    def vessel_specific_billing_report_data(self, vessel_name, start_date, end_date, period='monthly'):
+        """Gemiye özel faturalandırma raporunun verisi."""
+        df = self._get_all_port_operations_data(columns=['vessel_name', 'arrival_date', 'departure_date'])
+        if df.empty:
+            raise ReportDataError("Faturalandırma raporu için veri bulunamadı.")
+
+        # Gemiye göre filtrele
+        df_vessel_filtered = df[df['vessel_name'] == vessel_name]
+        if df_vessel_filtered.empty:
+            raise ReportDataError(f"'{vessel_name}' gemisi için faturalandırma verisi bulunamadı.")
+
+        report_data = self._billing_by_period(df_vessel_filtered, start_date, end_date, period)
+        report_data['vessel_name'] = vessel_name
+        return report_data
+
+    # --- Çizim adımları: data verilmezse veri adımını kendisi çalıştırır (ana thread'de çağrılmalıdır) ---
+
+    def generate_status_distribution(self, data=None):
+        """Konteyner durum dağılımını gösteren bir çubuk grafik oluşturur."""
+        status_counts = data if data is not None else self._load_report_data(self.status_distribution_data)
+        if status_counts is None:
             return None
 
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = self._new_figure(figsize=(10, 6))
         sns.barplot(x=status_counts.index, y=status_counts.values, ax=ax, palette='viridis')
         ax.set_title('Konteyner Durum Dağılımı', fontsize=14)
         ax.set_xlabel('Konteyner Durumu', fontsize=12)
         ax.set_ylabel('Sayı', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        return self._finish_figure(fig, ax)
 
-    def generate_location_distribution(self):
+    def generate_location_distribution(self, data=None):
         """
         Konteynerlerin lokasyon bazında dağılımını gösteren bir çubuk grafik oluşturur.
         Sadece en yoğun ilk 10 lokasyonu gösterir.
         """
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Konteyner lokasyon dağılımı raporu için veri bulunamadı.")
-            return None
-
-        # Geçerli lokasyon alanlarını filtrele
-        location_counts = df['location_area'].dropna().value_counts()
-
-        if location_counts.empty:
-            messagebox.showinfo("Rapor Hatası", "Konteyner lokasyon dağılımı raporu için yeterli veri yok.")
-            return None
-
-        # En yoğun ilk 10 lokasyonu al
         top_n = 10
-        top_locations = location_counts.head(top_n)
-
-        if top_locations.empty:
-            messagebox.showinfo("Rapor Hatası", f"En yoğun ilk {top_n} lokasyon için yeterli veri yok.")
+        top_locations = data if data is not None else self._load_report_data(self.location_distribution_data, top_n)
+        if top_locations is None:
             return None
 
-        fig, ax = plt.subplots(figsize=(12, 7))
+        fig, ax = self._new_figure(figsize=(12, 7))
         sns.barplot(x=top_locations.index, y=top_locations.values, ax=ax, palette='coolwarm')
         ax.set_title(f'En Yoğun Konteyner Lokasyonları (İlk {top_n})', fontsize=14)
         ax.set_xlabel('Lokasyon Alanı', fontsize=12)
         ax.set_ylabel('Konteyner Sayısı', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        return self._finish_figure(fig, ax)
 
-    def generate_monthly_operations(self):
+    def generate_monthly_operations(self, data=None):
         """Aylık işlem sayılarını gösteren bir çizgi grafik oluşturur."""
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Aylık işlem sayısı raporu için veri bulunamadı.")
-            return None
-
-        # 'timestamp' sütununda NaT değerlerini düşür
-        df_filtered = df.dropna(subset=['timestamp'])
-
-        if df_filtered.empty:
-            messagebox.showinfo("Rapor Hatası", "Aylık işlem sayısı raporu için geçerli zaman damgası verisi yok.")
-            return None
-
-        # Yıl ve ay bilgisini al
-        df_filtered['year_month'] = df_filtered['timestamp'].dt.to_period('M')
-        monthly_counts = df_filtered['year_month'].value_counts().sort_index()
-
-        if monthly_counts.empty:
-            messagebox.showinfo("Rapor Hatası", "Aylık işlem sayısı raporu için yeterli veri yok.")
+        monthly_counts = data if data is not None else self._load_report_data(self.monthly_operations_data)
+        if monthly_counts is None:
             return None
 
         # X ekseni etiketlerini Türkçe ay isimleri ve yıl olarak formatla
         x_labels = [f"{self.turkish_months[period.month]} {period.year}" for period in monthly_counts.index]
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._new_figure(figsize=(12, 6))
         sns.lineplot(x=monthly_counts.index.astype(str), y=monthly_counts.values, ax=ax, marker='o', color='skyblue')
         ax.set_title('Aylık Toplam Konteyner İşlem Sayısı', fontsize=14)
         ax.set_xlabel('Ay', fontsize=12)
@@ -164,38 +391,19 @@ class ReportGenerator:
         # Etiketleri ayarla
         ax.set_xticks(monthly_counts.index.astype(str))
         ax.set_xticklabels(x_labels, rotation=45, ha='right')
-        
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
-
-    def generate_annual_operations(self): # Fonksiyon adı değiştirildi
-        """Yıllık işlem sayılarını gösteren bir çizgi grafik oluşturur."""
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Yıllık işlem sayısı raporu için veri bulunamadı.")
-            return None
-
-        # 'timestamp' sütununda NaT değerlerini düşür
-        df_filtered = df.dropna(subset=['timestamp'])
-
-        if df_filtered.empty:
-            messagebox.showinfo("Rapor Hatası", "Yıllık işlem sayısı raporu için geçerli zaman damgası verisi yok.")
-            return None
 
-        # Yıllık periyoda çevir
-        df_filtered['year'] = df_filtered['timestamp'].dt.to_period('Y')
-        annual_counts = df_filtered['year'].value_counts().sort_index()
+        return self._finish_figure(fig, ax)
 
-        if annual_counts.empty:
-            messagebox.showinfo("Rapor Hatası", "Yıllık işlem sayısı raporu için yeterli veri yok.")
+    def generate_annual_operations(self, data=None): # Fonksiyon adı değiştirildi
+        """Yıllık işlem sayılarını gösteren bir çizgi grafik oluşturur."""
+        annual_counts = data if data is not None else self._load_report_data(self.annual_operations_data)
+        if annual_counts is None:
             return None
 
         # X ekseni etiketlerini yıl olarak formatla
         x_labels = [str(period.year) for period in annual_counts.index]
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._new_figure(figsize=(12, 6))
         sns.lineplot(x=annual_counts.index.astype(str), y=annual_counts.values, ax=ax, marker='o', color='lightcoral')
         ax.set_title('Yıllık Toplam Konteyner İşlem Sayısı', fontsize=14) # Başlık değiştirildi
         ax.set_xlabel('Yıl', fontsize=12) # Etiket değiştirildi
@@ -204,166 +412,47 @@ class ReportGenerator:
         # Etiketleri ayarla
         ax.set_xticks(annual_counts.index.astype(str))
         ax.set_xticklabels(x_labels, rotation=45, ha='right')
-        
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
 
-    def generate_top_ports(self):
-        """En yoğun limanları (varış ve kalkış) gösteren bir çubuk grafik oluşturur."""
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "En yoğun limanlar raporu için veri bulunamadı.")
-            return None
-
-        # Varış ve kalkış limanlarını birleştir
-        # NaN değerleri düşürerek sadece geçerli liman isimlerini al
-        arrival_ports = df['arrival_port'].dropna()
-        departure_ports = df['departure_port'].dropna()
-
-        # Her iki seriyi birleştir ve frekanslarını say
-        all_ports = pd.concat([arrival_ports, departure_ports])
-        port_counts_raw = all_ports.value_counts()
-
-        if port_counts_raw.empty:
-            messagebox.showinfo("Rapor Hatası", "En yoğun limanlar raporu için yeterli veri yok.")
-            return None
+        return self._finish_figure(fig, ax)
 
+    def generate_top_ports(self, data=None):
+        """En yoğun limanları (varış ve kalkış) gösteren bir çubuk grafik oluşturur."""
         top_n = 10
-        port_counts = port_counts_raw.head(top_n) # head() metodu artık boş olmayan bir seri üzerinde çağrılıyor
-
-        if port_counts.empty:
-            messagebox.showinfo("Rapor Hatası", f"En yoğun ilk {top_n} liman için yeterli veri yok.")
+        port_counts = data if data is not None else self._load_report_data(self.top_ports_data, top_n)
+        if port_counts is None:
             return None
 
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = self._new_figure(figsize=(10, 8))
         sns.barplot(x=port_counts.values, y=port_counts.index, ax=ax, palette='magma')
         ax.set_title(f'En Yoğun Limanlar (İlk {top_n} - Varış/Kalkış)', fontsize=14)
         ax.set_xlabel('İşlem Sayısı', fontsize=12)
         ax.set_ylabel('Liman', fontsize=12)
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
+        return self._finish_figure(fig, ax)
 
-    def generate_vessel_operation_counts(self):
+    def generate_vessel_operation_counts(self, data=None):
         """
         Gemiye göre konteyner işlem sayılarını gösteren bir çubuk grafik oluşturur.
         """
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Gemiye göre konteyner sayısı raporu için veri bulunamadı.")
-            return None
-
-        df_filtered = df.dropna(subset=['vessel_name'])
-        if df_filtered.empty:
-            messagebox.showinfo("Rapor Hatası", "Gemiye göre konteyner sayısı raporu için geçerli gemi adı verisi yok.")
-            return None
-
-        vessel_counts = df_filtered['vessel_name'].value_counts().head(10) # En çok işlem yapılan ilk 10 gemi
-        if vessel_counts.empty:
-            messagebox.showinfo("Rapor Hatası", "Gemiye göre konteyner sayısı raporu için yeterli veri yok.")
+        # En çok işlem yapılan ilk 10 gemi
+        vessel_counts = data if data is not None else self._load_report_data(self.vessel_operation_counts_data, 10)
+        if vessel_counts is None:
             return None
 
-        fig, ax = plt.subplots(figsize=(14, 7))
+        fig, ax = self._new_figure(figsize=(14, 7))
         sns.barplot(x=vessel_counts.index, y=vessel_counts.values, ax=ax, palette='cool')
         ax.set_title('En Çok Konteyner İşlemi Yapılan Gemiler (İlk 10)', fontsize=14)
         ax.set_xlabel('Gemi Adı', fontsize=12)
         ax.set_ylabel('İşlem Sayısı', fontsize=12)
-        ax.tick_params(axis='x', rotation=45, ha='right') # Etiketlerin üst üste binmesini engelle
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
-
-    def generate_billing_report(self, start_date=None, end_date=None, period='monthly'):
-        """
-        Belirli bir tarih aralığında ve periyotta (günlük, haftalık, aylık, yıllık)
-        toplam faturalandırma miktarını gösteren bir çizgi grafik oluşturur.
-        start_date ve end_date None ise, tüm veri setindeki min/max tarihleri kullanır.
-        """
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için veri bulunamadı.")
-            return None
-
-        # Eğer tarih aralığı belirtilmemişse, tüm veri setindeki min/max tarihleri bul
-        if start_date is None or end_date is None:
-            if 'arrival_date' not in df.columns or df['arrival_date'].isnull().all():
-                messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için geçerli 'Limana Giriş Tarihi' verisi bulunamadı.")
-                return None
-            
-            # DataFrame'deki en erken ve en geç tarihleri bul
-            min_date = df['arrival_date'].min()
-            max_date = df['arrival_date'].max()
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right') # Etiketlerin üst üste binmesini engelle
+        return self._finish_figure(fig, ax)
 
-            if pd.isna(min_date) or pd.isna(max_date):
-                messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için geçerli tarih aralığı bulunamadı.")
-                return None
-            
-            start_date = min_date
-            end_date = max_date
-
-        # start_date ve end_date'in timezone-naive olduğundan emin ol
-        if start_date.tzinfo is not None:
-            start_date = start_date.replace(tzinfo=None)
-        if end_date.tzinfo is not None:
-            end_date = end_date.replace(tzinfo=None)
-
-        # arrival_date'i baz alarak tarih aralığına göre filtrele
-        df_filtered = df[(df['arrival_date'] >= start_date) & (df['arrival_date'] <= end_date)].copy()
-        
-        # Gerekli sütunların varlığını kontrol et
-        required_cols = ['vessel_name', 'arrival_date', 'departure_date']
-        if not all(col in df_filtered.columns for col in required_cols):
-            messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için gerekli sütunlar (gemi adı, varış/çıkış tarihi) eksik.")
-            return None
-
-        # Fatura tutarlarını hesapla
-        df_filtered['billing_amount'] = df_filtered.apply(self._calculate_single_container_billing, axis=1)
-
-        if df_filtered['billing_amount'].sum() == 0:
-            messagebox.showinfo("Rapor Hatası", "Belirtilen tarih aralığında faturalandırılabilecek işlem bulunamadı veya tarifeler eksik.")
-            return None
-
-        # Periyoda göre grupla ve toplam fatura miktarını al
-        if period == 'daily':
-            freq = 'D'
-            title_period = 'Günlük'
-            xlabel = 'Tarih'
-            date_format = '%Y-%m-%d'
-        elif period == 'weekly':
-            freq = 'W'
-            title_period = 'Haftalık'
-            xlabel = 'Yıl-Hafta'
-            date_format = '%Y-%W'
-        elif period == 'monthly':
-            freq = 'M'
-            title_period = 'Aylık'
-            xlabel = 'Ay'
-            date_format = '%Y-%m'
-        elif period == 'yearly':
-            freq = 'Y'
-            title_period = 'Yıllık'
-            xlabel = 'Yıl'
-            date_format = '%Y'
-        else:
-            messagebox.warning("Rapor Hatası", "Geçersiz periyot seçimi. Lütfen 'daily', 'weekly', 'monthly' veya 'yearly' seçin.")
-            return None
-
-        # arrival_date'e göre grupla
-        billing_by_period = df_filtered.groupby(pd.Grouper(key='arrival_date', freq=freq))['billing_amount'].sum()
-        
-        # Boş dönemleri 0 ile doldur
-        billing_by_period = billing_by_period.asfreq(freq, fill_value=0)
-
-        if billing_by_period.empty:
-            messagebox.showinfo("Rapor Hatası", "Belirtilen periyot için faturalandırma verisi yok.")
-            return None
+    def _plot_billing_by_period(self, report_data, title_prefix, color):
+        """Periyot bazında fatura toplamlarını çizgi grafik olarak çizer."""
+        billing_by_period = report_data['billing_by_period']
+        period = report_data['period']
+        _, title_period, xlabel, date_format = BILLING_PERIODS[period]
 
         # X ekseni etiketlerini formatla
-        x_labels = []
         if period == 'monthly':
             x_labels = [f"{self.turkish_months[idx.month]} {idx.year}" for idx in billing_by_period.index]
         elif period == 'weekly':
@@ -372,120 +461,198 @@ class ReportGenerator:
         else: # daily, yearly
             x_labels = [idx.strftime(date_format) for idx in billing_by_period.index]
 
+        start_date = report_data['start_date']
+        end_date = report_data['end_date']
 
-        fig, ax = plt.subplots(figsize=(14, 7))
-        sns.lineplot(x=billing_by_period.index.astype(str), y=billing_by_period.values, ax=ax, marker='o', color='green')
-        ax.set_title(f'{title_period} Toplam Faturalandırma Miktarı ({start_date.strftime("%Y-%m-%d")} - {end_date.strftime("%Y-%m-%d")})', fontsize=14)
+        fig, ax = self._new_figure(figsize=(14, 7))
+        sns.lineplot(x=billing_by_period.index.astype(str), y=billing_by_period.values, ax=ax, marker='o', color=color)
+        ax.set_title(f'{title_prefix}{title_period} Toplam Faturalandırma Miktarı ({start_date.strftime("%Y-%m-%d")} - {end_date.strftime("%Y-%m-%d")})', fontsize=14)
         ax.set_xlabel(xlabel, fontsize=12)
         ax.set_ylabel('Toplam Fatura Miktarı ($)', fontsize=12)
         
         # Etiketleri ayarla
         ax.set_xticks(billing_by_period.index.astype(str))
         ax.set_xticklabels(x_labels, rotation=45, ha='right')
-        
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
 
-    def generate_vessel_specific_billing_report(self, vessel_name, start_date, end_date, period='monthly'):
+        return self._finish_figure(fig, ax)
+
+    def generate_billing_report(self, start_date=None, end_date=None, period='monthly', data=None):
         """
-        Belirli bir gemi için, belirli bir tarih aralığında ve periyotta
+        Belirli bir tarih aralığında ve periyotta (günlük, haftalık, aylık, yıllık)
         toplam faturalandırma miktarını gösteren bir çizgi grafik oluşturur.
+        start_date ve end_date None ise, tüm veri setindeki min/max tarihleri kullanır.
         """
-        df = self._get_all_port_operations_data()
-        if df.empty:
-            messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için veri bulunamadı.")
-            return None
-
-        # Gemiye göre filtrele
-        df_vessel_filtered = df[df['vessel_name'] == vessel_name].copy()
-        if df_vessel_filtered.empty:
-            messagebox.showinfo("Rapor Hatası", f"'{vessel_name}' gemisi için faturalandırma verisi bulunamadı.")
-            return None
-
-        # Tarih aralığına göre filtrele
-        # start_date ve end_date'in timezone-naive olduğundan emin ol
-        if start_date.tzinfo is not None:
-            start_date = start_date.replace(tzinfo=None)
-        if end_date.tzinfo is not None:
-            end_date = end_date.replace(tzinfo=None)
-
-        df_filtered_by_date = df_vessel_filtered[(df_vessel_filtered['arrival_date'] >= start_date) & (df_vessel_filtered['arrival_date'] <= end_date)].copy()
-        
-        if df_filtered_by_date.empty:
-            messagebox.showinfo("Rapor Hatası", f"'{vessel_name}' gemisi için belirtilen tarih aralığında faturalandırma verisi bulunamadı.")
-            return None
-
-        # Gerekli sütunların varlığını kontrol et
-        required_cols = ['vessel_name', 'arrival_date', 'departure_date']
-        if not all(col in df_filtered_by_date.columns for col in required_cols):
-            messagebox.showinfo("Rapor Hatası", "Faturalandırma raporu için gerekli sütunlar (gemi adı, varış/çıkış tarihi) eksik.")
-            return None
-
-        # Fatura tutarlarını hesapla
-        df_filtered_by_date['billing_amount'] = df_filtered_by_date.apply(self._calculate_single_container_billing, axis=1)
-
-        if df_filtered_by_date['billing_amount'].sum() == 0:
-            messagebox.showinfo("Rapor Hatası", "Belirtilen tarih aralığında faturalandırılabilecek işlem bulunamadı veya tarifeler eksik.")
-            return None
-
-        # Periyoda göre grupla ve toplam fatura miktarını al
-        if period == 'daily':
-            freq = 'D'
-            title_period = 'Günlük'
-            xlabel = 'Tarih'
-            date_format = '%Y-%m-%d'
-        elif period == 'weekly':
-            freq = 'W'
-            title_period = 'Haftalık'
-            xlabel = 'Yıl-Hafta'
-            date_format = '%Y-%W'
-        elif period == 'monthly':
-            freq = 'M'
-            title_period = 'Aylık'
-            xlabel = 'Ay'
-            date_format = '%Y-%m'
-        elif period == 'yearly':
-            freq = 'Y'
-            title_period = 'Yıllık'
-            xlabel = 'Yıl'
-            date_format = '%Y'
-        else:
-            messagebox.warning("Rapor Hatası", "Geçersiz periyot seçimi. Lütfen 'daily', 'weekly', 'monthly' veya 'yearly' seçin.")
+        report_data = data if data is not None else self._load_report_data(self.billing_report_data, start_date, end_date, period)
+        if report_data is None:
             return None
+        return self._plot_billing_by_period(report_data, '', 'green')
 
-        # arrival_date'e göre grupla
-        billing_by_period = df_filtered_by_date.groupby(pd.Grouper(key='arrival_date', freq=freq))['billing_amount'].sum()
-        
-        # Boş dönemleri 0 ile doldur
-        billing_by_period = billing_by_period.asfreq(freq, fill_value=0)
-
-        if billing_by_period.empty:
-            messagebox.showinfo("Rapor Hatası", "Belirtilen periyot için faturalandırma verisi yok.")
+    def generate_vessel_specific_billing_report(self, vessel_name, start_date, end_date, period='monthly', data=None):
+        """
+        Belirli bir gemi için, belirli bir tarih aralığında ve periyotta
+        toplam faturalandırma miktarını gösteren bir çizgi grafik oluşturur.
+        """
+        report_data = data if data is not None else self._load_report_data(
+            self.vessel_specific_billing_report_data, vessel_name, start_date, end_date, period
+        )
+        if report_data is None:
             return None
-
-        # X ekseni etiketlerini formatla
-        x_labels = []
-        if period == 'monthly':
-            x_labels = [f"{self.turkish_months[idx.month]} {idx.year}" for idx in billing_by_period.index]
-        elif period == 'weekly':
-            x_labels = [f"{idx.year}-{idx.isocalendar()[1]}. Hafta" for idx in billing_by_period.index]
-        else: # daily, yearly
-            x_labels = [idx.strftime(date_format) for idx in billing_by_period.index]
-
-
-        fig, ax = plt.subplots(figsize=(14, 7))
-        sns.lineplot(x=billing_by_period.index.astype(str), y=billing_by_period.values, ax=ax, marker='o', color='purple')
-        ax.set_title(f'{vessel_name} - {title_period} Toplam Faturalandırma Miktarı ({start_date.strftime("%Y-%m-%d")} - {end_date.strftime("%Y-%m-%d")})', fontsize=14)
-        ax.set_xlabel(xlabel, fontsize=12)
-        ax.set_ylabel('Toplam Fatura Miktarı ($)', fontsize=12)
-        
-        # Etiketleri ayarla
-        ax.set_xticks(billing_by_period.index.astype(str))
-        ax.set_xticklabels(x_labels, rotation=45, ha='right')
-        
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        return fig
+        return self._plot_billing_by_period(report_data, f'{vessel_name} - ', 'purple')
+
+
+def _report_series(data):
+    """Rapor verisinden çizilen seriyi ve başlığı etkileyen ek bilgileri (fatura raporlarında tarih aralığı) ayırır."""
+    if isinstance(data, dict):
+        return data['billing_by_period'], (data['start_date'], data['end_date'], data['period'])
+    return data, None
+
+
+def update_report_figure(fig, report_name, old_data, new_data):
+    """
+    Çizilmiş bir rapor grafiğini yeniden oluşturmadan yeni veriyle günceller: çubuk yükseklikleri/genişlikleri veya
+    çizgi y değerleri yerinde değiştirilir ve eksenler yeniden ölçeklenir. Kategoriler (eksen etiketleri) veya
+    başlık bilgileri değiştiyse hiçbir şey yapmaz ve False döndürür; bu durumda grafik yeniden çizilmelidir.
+    """
+    old_series, old_extra = _report_series(old_data)
+    new_series, new_extra = _report_series(new_data)
+    if not fig.axes or old_extra != new_extra or not old_series.index.equals(new_series.index):
+        return False
+
+    ax = fig.axes[0]
+    values = new_series.to_numpy(dtype=float)
+    if report_name in _BAR_REPORTS or report_name in _HORIZONTAL_BAR_REPORTS:
+        if len(ax.patches) != len(values):
+            return False
+        for patch, value in zip(ax.patches, values):
+            if report_name in _HORIZONTAL_BAR_REPORTS:
+                patch.set_width(value)
+            else:
+                patch.set_height(value)
+    else:
+        if not ax.lines:
+            return False
+        ax.lines[0].set_ydata(values)
+    ax.relim()
+    ax.autoscale_view()
+    fig.canvas.draw_idle()
+    return True
+
+
+def _init_render_worker():
+    # İşçi süreçler yalnızca dosyaya çizer; GUI backend'i yüklenmez
+    matplotlib.use('Agg', force=True)
+
+
+def _render_report(report_name, args, data, path, output_format):
+    """Önceden hazırlanmış rapor verisini etkileşimsiz çizip dosyaya kaydeder; Figure nesnesini döndürür."""
+    _, render_method, render_takes_args = REPORT_TYPES[report_name]
+    reporter = ReportGenerator(None, interactive=False)
+    fig = getattr(reporter, render_method)(*(args if render_takes_args else ()), data=data)
+    fig.savefig(path, format=output_format)
+    return fig
+
+
+def _render_report_to_file(*job):
+    """İşçi süreçte çalışır: raporu çizip kaydeder ve çizim süresini döndürür (Figure süreçler arasında taşınmaz)."""
+    started = time.perf_counter()
+    _render_report(*job)
+    return time.perf_counter() - started
+
+
+def render_report_batch(db_manager, reports, output_dir, output_format='png', max_workers=None, aggregate_in_db=True):
+    """
+    Birden çok raporu etkileşimsiz (Agg) olarak output_dir altına output_format (png/svg/pdf) dosyaları halinde çizer.
+    reports: rapor adları veya (rapor adı, parametreler[, dosya adı]) demetleri (bkz. REPORT_TYPES).
+    Veri adımları bu süreçte sırayla ve port_operations verisini paylaşarak çalışır; çizimler süreç havuzunda paralel yapılır.
+    Havuz modunda (max_workers None veya > 0) çizimler yalnızca dosya olarak döner: 'figure' her zaman None'dır,
+    sonuç 'path' alanındaki dosyadır (Figure nesneleri süreçler arasında taşınmaz). Figure nesnesi gerekiyorsa
+    max_workers=0 verilir; çizim bu süreçte yapılır ve 'figure' alanında döner.
+    Her rapor için {'report', 'path', 'data_seconds', 'render_seconds', 'figure', 'error'} listesi döndürür.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Geçersiz çıktı biçimi: {output_format}")
+    os.makedirs(output_dir, exist_ok=True)
+    reporter = ReportGenerator(db_manager, aggregate_in_db=aggregate_in_db, interactive=False)
+
+    results = []
+    jobs = []
+    with reporter.shared_data():
+        for index, spec in enumerate(reports):
+            report_name, args, file_name = (spec, (), None) if isinstance(spec, str) else (tuple(spec) + (None,))[:3]
+            args = tuple(args or ())
+            result = {'report': report_name, 'path': None, 'data_seconds': 0.0, 'render_seconds': 0.0, 'figure': None, 'error': None}
+            results.append(result)
+            if report_name not in REPORT_TYPES:
+                result['error'] = f"Bilinmeyen rapor: {report_name}"
+                continue
+            started = time.perf_counter()
+            try:
+                data = getattr(reporter, REPORT_TYPES[report_name][0])(*args)
+            except ReportDataError as e:
+                result['error'] = str(e)
+                continue
+            finally:
+                result['data_seconds'] = time.perf_counter() - started
+            result['path'] = os.path.join(output_dir, f"{file_name or f'{index + 1:02d}_{report_name}'}.{output_format}")
+            jobs.append((result, (report_name, args, data, result['path'], output_format)))
+
+    if max_workers == 0:
+        for result, job in jobs:
+            started = time.perf_counter()
+            try:
+                result['figure'] = _render_report(*job)
+            except Exception as e:
+                result['error'] = f"Çizim hatası: {e}"
+            result['render_seconds'] = time.perf_counter() - started
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker) as executor:
+        futures = [(result, executor.submit(_render_report_to_file, *job)) for result, job in jobs]
+        for result, future in futures:
+            try:
+                result['render_seconds'] = future.result()
+            except Exception as e:
+                result['error'] = f"Çizim hatası: {e}"
+    return results
+
+
+def main(argv=None):
+    """Gece rapor paketi: python reports.py --output-dir raporlar --format pdf [rapor ...]"""
+    parser = argparse.ArgumentParser(description="Raporları etkileşimsiz olarak dosyalara çizer")
+    parser.add_argument('reports', nargs='*', help="Çizilecek raporlar (varsayılan: parametresiz tüm raporlar ve tüm veri için fatura raporu)")
+    parser.add_argument('--output-dir', default='reports_output')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='png')
+    parser.add_argument('--workers', type=int, default=None, help="Çizim süreci sayısı (0: aynı süreçte)")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Veriyi yerel port_operations kopyasından oku (önce yalnızca yeni satırlar çekilir)")
+    args = parser.parse_args(argv)
+
+    from config import app_config # GUI'den içe aktarıldığında konfigürasyon dosyası okunmasın diye burada
+    if not app_config.DB_PASSWORD:
+        print("Veritabanı şifresi bulunamadı! DB_PASSWORD tanımlanmalı.")
+        return 2
+
+    reports = args.reports or [name for name, (_, _, takes_args) in REPORT_TYPES.items() if not takes_args] + ['billing']
+    db = DBManager(**app_config.get_db_config())
+    try:
+        started = time.perf_counter()
+        source = db
+        if args.snapshot:
+            if db.snapshot is None:
+                print("Yerel kopya kapalı. app.ini [snapshot] path ayarını yapın.")
+                return 2
+            db.snapshot.refresh()
+            source = db.snapshot
+        results = render_report_batch(source, reports, args.output_dir, args.format, args.workers)
+    finally:
+        db.close()
+
+    for result in results:
+        status = result['path'] if not result['error'] else f"HATA: {result['error']}"
+        print(f"{result['report']:25} veri {result['data_seconds']:7.2f} sn  çizim {result['render_seconds']:7.2f} sn  {status}")
+    print(f"Toplam süre: {time.perf_counter() - started:.2f} sn")
+    return 1 if any(result['error'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+ReportGenerator.calculate_billing_details'in vektörel hesabını, yerine geçtiği satır satır fatura döngüsüyle
+(_calculate_single_container_billing) karşılaştırır.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from reports import ReportGenerator
+
+
+TARIFFS = pd.DataFrame({'vessel_name': ['MSC Anna', 'Ever Given'], 'daily_rate': [100.0, 37.5]})
+
+
+class TariffSource:
+    """Tarifeleri DBManager'daki gibi (gemi adı büyük/küçük harf duyarsız) veren küçük veri kaynağı."""
+
+    def __init__(self, tariffs):
+        self.tariffs = tariffs
+
+    def get_vessel_tariff(self, vessel_name):
+        if vessel_name is None:
+            return None
+        matches = self.tariffs[self.tariffs['vessel_name'].str.lower() == str(vessel_name).lower()]
+        return matches['daily_rate'].iloc[0] if not matches.empty else None
+
+    def get_cached_vessel_tariffs(self):
+        return self.tariffs
+
+
+def row_by_row_billing(db, container_data):
+    """Eski _calculate_single_container_billing: tek konteynerin kalış süresi ve tarifesiyle fatura tutarı."""
+    vessel_name = container_data.get('vessel_name')
+    arrival_date = container_data.get('arrival_date')
+    departure_date = container_data.get('departure_date')
+
+    total_cost = 0.0
+    if isinstance(arrival_date, pd.Timestamp):
+        arrival_date = arrival_date.to_pydatetime()
+    if isinstance(departure_date, pd.Timestamp):
+        departure_date = departure_date.to_pydatetime()
+
+    if isinstance(arrival_date, datetime) and isinstance(departure_date, datetime):
+        if departure_date >= arrival_date:
+            stay_duration = departure_date - arrival_date
+            stay_duration_days = stay_duration.days
+            if stay_duration_days == 0 and stay_duration.total_seconds() > 0: # Aynı gün içinde ama saat farkı varsa 1 gün say
+                stay_duration_days = 1
+            daily_rate = db.get_vessel_tariff(vessel_name)
+            if daily_rate is not None:
+                total_cost = stay_duration_days * float(daily_rate)
+    return total_cost
+
+
+def make_operations(rows):
+    df = pd.DataFrame(rows, columns=['vessel_name', 'arrival_date', 'departure_date'])
+    for col in ['arrival_date', 'departure_date']:
+        df[col] = pd.to_datetime(df[col], format='ISO8601')
+    return df
+
+
+CASES = {
+    'multi_day': [('MSC Anna', '2024-01-01 08:00', '2024-01-04 07:00')],
+    'nat_departure': [('MSC Anna', '2024-01-01 08:00', None), ('Ever Given', None, '2024-01-03')],
+    'same_day_with_hours': [('Ever Given', '2024-02-10 08:00', '2024-02-10 17:30')],
+    'same_instant': [('Ever Given', '2024-02-10 08:00', '2024-02-10 08:00')],
+    'departure_before_arrival': [('MSC Anna', '2024-03-05', '2024-03-01')],
+    'no_tariff': [('Unknown Vessel', '2024-01-01', '2024-01-10'), (None, '2024-01-01', '2024-01-10')],
+    'case_insensitive_name': [('msc anna', '2024-01-01', '2024-01-03'), ('EVER GIVEN', '2024-01-01', '2024-01-02 00:00:01')],
+}
+
+
+@pytest.mark.parametrize('rows', CASES.values(), ids=CASES.keys())
+def test_vectorized_billing_matches_row_by_row(rows):
+    db = TariffSource(TARIFFS)
+    df = make_operations(rows)
+    expected = df.apply(lambda row: row_by_row_billing(db, row), axis=1).to_numpy(dtype=float)
+
+    details = ReportGenerator(db, interactive=False).calculate_billing_details(df)
+
+    np.testing.assert_allclose(details['billing_amount'].to_numpy(), expected)
+    assert details.index.equals(df.index)
+
+
+def test_vectorized_billing_matches_row_by_row_on_mixed_frame():
+    rows = [row for case in CASES.values() for row in case]
+    db = TariffSource(TARIFFS)
+    df = make_operations(rows).set_index(pd.Index(range(100, 100 + len(rows))))
+    expected = df.apply(lambda row: row_by_row_billing(db, row), axis=1)
+
+    billing = ReportGenerator(db, interactive=False).calculate_billing(df)
+
+    pd.testing.assert_series_equal(billing, expected, check_names=False)
+
+
+def test_vessels_without_tariff_bill_zero_with_empty_tariff_table():
+    db = TariffSource(pd.DataFrame({'vessel_name': pd.Series(dtype=str), 'daily_rate': pd.Series(dtype=float)}))
+    df = make_operations(CASES['multi_day'] + CASES['same_day_with_hours'])
+
+    details = ReportGenerator(db, interactive=False).calculate_billing_details(df)
+
+    assert details['billing_amount'].tolist() == [0.0, 0.0]
+    assert details['daily_rate'].isna().all()
+    assert details['stay_duration_days'].tolist() == [2, 1]